@@ -22,4 +22,9 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    # Long-running tasks are acknowledged only after they finish; fetch one
+    # at a time so a lost worker does not strand a prefetched backlog
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
 )
\ No newline at end of file
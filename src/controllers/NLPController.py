@@ -1,7 +1,7 @@
 """NLP and RAG controller for document vectorization and semantic search"""
 
 import logging
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -12,10 +12,13 @@ from helpers.exceptions import (
 )
 from helpers.logger import setup_logger
 from models.db_models import Chunk, Asset, Project
-from stores.vector_store import VectorStore
+from stores.vector_store import VectorStore, where_filter
 from stores.embedding_service import AsyncEmbeddingService
 from repositories.project_repository import ProjectRepository
 
+if TYPE_CHECKING:
+    from tasks.vectorize_documents import VectorizationTask
+
 logger = setup_logger(__name__)
 
 
@@ -26,7 +29,8 @@ class NLPController:
         self,
         db: AsyncSession,
         embedding_model: str = "sentence-transformers",
-        vector_store_dir: Optional[str] = None
+        vector_store_dir: Optional[str] = None,
+        vtask: Optional["VectorizationTask"] = None
     ):
         """
         Initialize NLP controller
@@ -35,12 +39,18 @@ class NLPController:
             db: Database session
             embedding_model: Type of embedding model ("sentence-transformers" or "openai")
             vector_store_dir: Directory for ChromeDB persistence
+            vtask: Optional shared VectorizationTask whose embedding service
+                   and vector store are reused instead of constructing new ones
         """
         self.db = db
         self.repo = ProjectRepository(db)
         self.logger = logger
-        self.embedding_service = AsyncEmbeddingService(embedding_model)
-        self.vector_store = VectorStore(vector_store_dir)
+        if vtask is not None:
+            self.embedding_service = vtask.embedding_service
+            self.vector_store = vtask.vector_store
+        else:
+            self.embedding_service = AsyncEmbeddingService(embedding_model)
+            self.vector_store = VectorStore(vector_store_dir)
     
     async def vectorize_chunks(
         self,
@@ -130,7 +140,7 @@ class NLPController:
                 "project_id": project_id,
                 "chunks_processed": len(chunks),
                 "chunks_vectorized": len(embeddings),
-                "embedding_dimension": len(embeddings[0]) if embeddings else 0
+                "embedding_dimension": len(embeddings[0]) if len(embeddings) else 0
             }
             
         except ResourceNotFoundException:
@@ -182,12 +192,10 @@ class NLPController:
             query_embedding = await self.embedding_service.embed_query_async(query)
             
             # Search vector store with project filter
-            where_filter = {"project_id": {"$eq": project_id}}
-            
             results = self.vector_store.query(
                 query_embedding=query_embedding,
                 n_results=n_results,
-                where=where_filter
+                where=where_filter(project_id)
             )
             
             similar_chunks = []
@@ -1,7 +1,7 @@
 """Document processing controller for chunking and preparing documents"""
 
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -16,7 +16,8 @@ from repositories.project_repository import ProjectRepository
 from utils.document_processor import (
     DocumentProcessor,
     ChunkingStrategy,
-    TokenCounter
+    TokenCounter,
+    clear_token_caches
 )
 
 logger = setup_logger(__name__)
@@ -99,7 +100,7 @@ class ProcessingController:
             self.logger.info(f"Extracted {len(text)} characters from asset {asset_id}")
             
             # Chunk text based on strategy
-            chunks = self._chunk_text(text, strategy, chunk_size, chunk_overlap)
+            chunks, token_counts = self._chunk_text(text, strategy, chunk_size, chunk_overlap)
             
             if not chunks:
                 raise ValidationException("No chunks generated from document", field="chunks")
@@ -108,9 +109,7 @@ class ProcessingController:
             
             # Store chunks in database
             stored_chunks = []
-            for chunk_index, chunk_content in enumerate(chunks):
-                token_count = TokenCounter.count_tokens(chunk_content)
-                
+            for chunk_index, (chunk_content, token_count) in enumerate(zip(chunks, token_counts)):
                 chunk = Chunk(
                     project_id=project_id,
                     asset_id=asset_id,
@@ -156,6 +155,9 @@ class ProcessingController:
         except Exception as e:
             self.logger.error(f"Processing failed for asset {asset_id}: {str(e)}")
             raise DatabaseException(f"Asset processing failed: {str(e)}", operation="process")
+        finally:
+            # Don't let token counts accumulate across assets (and task runs)
+            clear_token_caches()
     
     async def batch_process_assets(
         self,
@@ -254,10 +256,13 @@ class ProcessingController:
         strategy: str,
         chunk_size: int,
         chunk_overlap: int
-    ) -> List[str]:
+    ) -> Tuple[List[str], List[int]]:
         """
         Internal method to chunk text based on strategy
         
+        The "tokens" strategy takes each chunk's token count from the same
+        encoding pass that chunked it; other strategies count per chunk.
+        
         Args:
             text: Text to chunk
             strategy: Chunking strategy
@@ -265,19 +270,23 @@ class ProcessingController:
             chunk_overlap: Overlap parameter
             
         Returns:
-            List of text chunks
+            Tuple of (list of text chunks, token count of each chunk)
         """
+        if strategy == "tokens":
+            _, chunks, token_counts = ChunkingStrategy.encode_and_chunk(text, chunk_size, chunk_overlap)
+            return chunks, token_counts
+        
         if strategy == "size":
-            return ChunkingStrategy.chunk_by_size(text, chunk_size, chunk_overlap)
-        elif strategy == "tokens":
-            return ChunkingStrategy.chunk_by_tokens(text, chunk_size, chunk_overlap)
+            chunks = ChunkingStrategy.chunk_by_size(text, chunk_size, chunk_overlap)
         elif strategy == "sentences":
-            return ChunkingStrategy.chunk_by_sentences(text, chunk_size, chunk_overlap)
+            chunks = ChunkingStrategy.chunk_by_sentences(text, chunk_size, chunk_overlap)
         elif strategy == "paragraphs":
-            return ChunkingStrategy.chunk_by_paragraphs(text)
+            chunks = ChunkingStrategy.chunk_by_paragraphs(text)
         else:
             self.logger.warning(f"Unknown strategy {strategy}, defaulting to 'size'")
-            return ChunkingStrategy.chunk_by_size(text, chunk_size, chunk_overlap)
+            chunks = ChunkingStrategy.chunk_by_size(text, chunk_size, chunk_overlap)
+        
+        return chunks, [TokenCounter.count_tokens(chunk) for chunk in chunks]
     
     async def get_chunk_stats(
         self,
@@ -1,7 +1,7 @@
 """RAG (Retrieval-Augmented Generation) controller combining retrieval and generation"""
 
 import logging
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 
@@ -17,6 +17,9 @@ from controllers.NLPController import NLPController
 from utils.llm_provider import LLMProviderFactory, BaseLLMProvider
 from utils.document_processor import TokenCounter
 
+if TYPE_CHECKING:
+    from tasks.vectorize_documents import VectorizationTask
+
 logger = setup_logger(__name__)
 
 
@@ -27,7 +30,8 @@ class RAGController:
         self,
         db: AsyncSession,
         llm_provider: Optional[BaseLLMProvider] = None,
-        embedding_model: str = "sentence-transformers"
+        embedding_model: str = "sentence-transformers",
+        vtask: Optional["VectorizationTask"] = None
     ):
         """
         Initialize RAG controller
@@ -36,11 +40,12 @@ class RAGController:
             db: Database session
             llm_provider: LLM provider instance (optional)
             embedding_model: Embedding model type
+            vtask: Optional shared VectorizationTask passed to the NLP controller
         """
         self.db = db
         self.repo = ProjectRepository(db)
         self.logger = logger
-        self.nlp_controller = NLPController(db, embedding_model)
+        self.nlp_controller = NLPController(db, embedding_model, vtask=vtask)
         self.llm_provider = llm_provider
     
     async def rag_query(
@@ -209,7 +214,7 @@ class RAGController:
                 "status": "success",
                 "project_id": project_id,
                 "chunks_updated": updated_count,
-                "embedding_dimension": len(embeddings[0]) if embeddings else 0
+                "embedding_dimension": len(embeddings[0]) if len(embeddings) else 0
             }
             
         except ResourceNotFoundException:
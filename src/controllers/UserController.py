@@ -3,7 +3,7 @@
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
-from helpers.password import hash_password, verify_password
+from helpers.password import hash_password, verify_password, needs_rehash
 from helpers.logger import logger
 from models.user import User, UserRole
 
@@ -70,8 +70,13 @@ class UserController:
             logger.warning(f"Failed login for user: {username}")
             return None
         
-        # Update last login
-        stmt = update(User).where(User.id == user.id).values(last_login=datetime.utcnow())
+        # Update last login, upgrading legacy or outdated hashes in the same write
+        values = {"last_login": datetime.utcnow()}
+        if needs_rehash(user.hashed_password):
+            values["hashed_password"] = hash_password(password)
+            logger.info(f"Rehashed password for user: {username}")
+        
+        stmt = update(User).where(User.id == user.id).values(**values)
         await db.execute(stmt)
         await db.commit()
         await db.refresh(user)
@@ -35,9 +35,18 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str = "sentence-transformers"  # sentence-transformers or openai
     VECTOR_STORE_DIR: str = "./chroma_data"
 
+    # Celery / Redis
+    CELERY_BROKER_URL: str = "redis://localhost:6379/0"
+    CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+
     # Rate Limiting
     RATE_LIMIT_DEFAULT: str = "100/hour"
 
+    # Password hashing (argon2id cost parameters)
+    PW_TIME_COST: int = 3
+    PW_MEMORY_COST: int = 65536  # KiB
+    PW_PARALLELISM: int = 4
+
     # Security - CORS Origins
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173", "http://localhost:8000"]
     ALLOWED_HOSTS: List[str] = ["localhost", "127.0.0.1"]
@@ -1,7 +1,7 @@
 """Custom exception classes for the application"""
 
 from fastapi import HTTPException, status
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Tuple
 
 
 class AppException(Exception):
@@ -77,6 +77,26 @@ class ConfigException(AppException):
         self.config_key = config_key
 
 
+# Error code -> (HTTP status, optional attributes copied into the detail when set)
+_HTTP_DISPATCH: Dict[str, Tuple[int, Tuple[str, ...]]] = {
+    "VALIDATION_ERROR": (status.HTTP_400_BAD_REQUEST, ("field",)),
+    "AUTHENTICATION_ERROR": (status.HTTP_401_UNAUTHORIZED, ()),
+    "PERMISSION_DENIED": (status.HTTP_403_FORBIDDEN, ()),
+    "RESOURCE_NOT_FOUND": (status.HTTP_404_NOT_FOUND, ("resource_type",)),
+    "FILE_UPLOAD_ERROR": (status.HTTP_400_BAD_REQUEST, ("reason",)),
+    "PROCESSING_ERROR": (status.HTTP_422_UNPROCESSABLE_ENTITY, ()),
+    "DATABASE_ERROR": (status.HTTP_500_INTERNAL_SERVER_ERROR, ()),
+    "CONFIG_ERROR": (status.HTTP_500_INTERNAL_SERVER_ERROR, ()),
+    "APP_ERROR": (status.HTTP_500_INTERNAL_SERVER_ERROR, ()),
+}
+# Unlisted codes (e.g. AppException subclasses with their own code) get every
+# context attribute the converter knows about
+_DEFAULT_DISPATCH: Tuple[int, Tuple[str, ...]] = (
+    status.HTTP_500_INTERNAL_SERVER_ERROR,
+    ("field", "resource_type", "reason"),
+)
+
+
 def app_exception_to_http_exception(exc: AppException) -> HTTPException:
     """
     Convert application exception to FastAPI HTTPException
@@ -87,20 +107,7 @@ def app_exception_to_http_exception(exc: AppException) -> HTTPException:
     Returns:
         HTTPException suitable for FastAPI response
     """
-    
-    status_code_map = {
-        "VALIDATION_ERROR": status.HTTP_400_BAD_REQUEST,
-        "AUTHENTICATION_ERROR": status.HTTP_401_UNAUTHORIZED,
-        "PERMISSION_DENIED": status.HTTP_403_FORBIDDEN,
-        "RESOURCE_NOT_FOUND": status.HTTP_404_NOT_FOUND,
-        "FILE_UPLOAD_ERROR": status.HTTP_400_BAD_REQUEST,
-        "PROCESSING_ERROR": status.HTTP_422_UNPROCESSABLE_ENTITY,
-        "DATABASE_ERROR": status.HTTP_500_INTERNAL_SERVER_ERROR,
-        "CONFIG_ERROR": status.HTTP_500_INTERNAL_SERVER_ERROR,
-        "APP_ERROR": status.HTTP_500_INTERNAL_SERVER_ERROR,
-    }
-    
-    http_status = status_code_map.get(exc.code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+    http_status, context_attrs = _HTTP_DISPATCH.get(exc.code, _DEFAULT_DISPATCH)
     
     detail: Dict[str, Any] = {
         "error": exc.code,
@@ -108,11 +115,9 @@ def app_exception_to_http_exception(exc: AppException) -> HTTPException:
     }
     
     # Add additional context if available
-    if hasattr(exc, 'field') and exc.field:
-        detail["field"] = exc.field
-    if hasattr(exc, 'resource_type') and exc.resource_type:
-        detail["resource_type"] = exc.resource_type
-    if hasattr(exc, 'reason') and exc.reason:
-        detail["reason"] = exc.reason
+    for attr in context_attrs:
+        value = getattr(exc, attr, None)
+        if value:
+            detail[attr] = value
     
-    return HTTPException(status_code=http_status, detail=detail)
\ No newline at end of file
+    return HTTPException(status_code=http_status, detail=detail)
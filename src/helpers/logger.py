@@ -44,11 +44,16 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
     
-    def format(self, record):
-        if sys.platform == "win32":
-            # Windows doesn't support ANSI colors well, so skip coloring
-            return super().format(record)
-        
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Windows doesn't support ANSI colors well, so skip coloring there;
+        # the platform is fixed, so choose the path once instead of per record
+        self.format = self._format_plain if sys.platform == "win32" else self._format_colored
+    
+    def _format_plain(self, record):
+        return super().format(record)
+    
+    def _format_colored(self, record):
         levelname = record.levelname
         if levelname in self.COLORS:
             record.levelname = f"{self.COLORS[levelname]}{levelname}{self.RESET}"
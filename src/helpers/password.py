@@ -2,14 +2,32 @@
 
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from helpers.config import get_settings
+
+_settings = get_settings()
+
+# New hashes use argon2id; bcrypt is kept so existing hashes still verify.
+# Cost parameters come from Settings so test/dev can hash in ~1ms.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=_settings.PW_TIME_COST,
+    argon2__memory_cost=_settings.PW_MEMORY_COST,
+    argon2__parallelism=_settings.PW_PARALLELISM,
+)
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
+    """Hash a password using argon2id"""
     return pwd_context.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password"""
+    """Verify a plain password against an argon2id or legacy bcrypt hash"""
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Check whether a hash uses legacy bcrypt or outdated argon2 costs"""
+    return pwd_context.needs_update(hashed_password)
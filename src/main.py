@@ -91,6 +91,9 @@ async def lifespan(app: FastAPI):
         print("[SUCCESS] Database connection closed")
     except Exception as e:
         print(f"[WARNING] Error closing database: {e}")
+    
+    await rag.close_llm_providers()
+    print("[SUCCESS] LLM provider clients closed")
 
 
 app = FastAPI(
@@ -18,6 +18,8 @@ class VectorFallback(TypeDecorator):
     def process_bind_param(self, value, dialect):
         if value is None:
             return None
+        if hasattr(value, "tolist"):
+            value = value.tolist()
         if isinstance(value, list):
             return json.dumps(value)
         return value
@@ -6,7 +6,7 @@ import logging
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from helpers.database import get_db
@@ -93,14 +93,18 @@ async def vectorize_chunks(
 )
 async def search_chunks(
     request: SearchRequest,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     token: str = Depends(verify_token)
 ):
     """
     Search for chunks similar to a query
     
+    Sets X-Cache to HIT when the query embedding came from the cache.
+    
     Args:
         request: Search request with query and filters
+        response: Outgoing response, for the X-Cache header
         db: Database session
         token: JWT authentication token
         
@@ -112,6 +116,7 @@ async def search_chunks(
     """
     try:
         controller = NLPController(db)
+        cache_hit = controller.embedding_service.is_query_cached(request.query)
         results = await controller.search_similar_chunks(
             project_id=request.project_id,
             query=request.query,
@@ -119,6 +124,7 @@ async def search_chunks(
             threshold=request.threshold
         )
         
+        response.headers["X-Cache"] = "HIT" if cache_hit else "MISS"
         return SearchResponse(
             query=request.query,
             project_id=request.project_id,
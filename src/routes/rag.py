@@ -17,7 +17,7 @@ from helpers.exceptions import ResourceNotFoundException, ValidationException, D
 from helpers.jwt_handler import verify_token
 from helpers.config import get_settings
 from controllers.RAGController import RAGController
-from utils.llm_provider import LLMProviderFactory
+from utils.llm_provider import BaseLLMProvider, LLMProviderFactory
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -134,8 +134,38 @@ class RAGStats(BaseModel):
     vector_store_info: Dict[str, Any]
 
 
+# Providers live for the whole process, one per configuration, so API-backed
+# providers reuse their pooled HTTP client across requests; closed on shutdown
+_LLM_PROVIDERS: Dict[tuple, BaseLLMProvider] = {}
+
+
 def _get_llm_provider(settings):
-    """Get LLM provider from settings"""
+    """Get the process-wide LLM provider for the configured settings"""
+    key = (
+        settings.LLM_PROVIDER,
+        settings.LLM_API_KEY,
+        getattr(settings, "LLM_BASE_URL", None),
+        getattr(settings, "LLM_MODEL", None),
+    )
+    provider = _LLM_PROVIDERS.get(key)
+    if provider is None:
+        provider = _LLM_PROVIDERS[key] = _create_llm_provider(settings)
+    return provider
+
+
+async def close_llm_providers():
+    """Close the HTTP clients of every cached LLM provider"""
+    providers = list(_LLM_PROVIDERS.values())
+    _LLM_PROVIDERS.clear()
+    for provider in providers:
+        try:
+            await provider.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close LLM provider: {str(e)}")
+
+
+def _create_llm_provider(settings):
+    """Create an LLM provider from settings"""
     try:
         provider_type = settings.LLM_PROVIDER or "mock"
         api_key = settings.LLM_API_KEY
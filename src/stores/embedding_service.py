@@ -1,7 +1,267 @@
 """Embedding generation service for document vectorization"""
 
-from typing import List, Optional, Union
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
 import asyncio
+import threading
+import weakref
+
+import numpy as np
+
+from helpers.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+# Sentence-transformer behind both EmbeddingService and the worker GPU model
+SENTENCE_TRANSFORMER_MODEL = "all-MiniLM-L6-v2"
+
+# Worker-resident GPU model, loaded once per process by init_gpu_model()
+_GPU_MODEL = None
+_GPU_MODEL_NAME: Optional[str] = None
+
+# Coalescing window for embed_coalesced()
+COALESCE_WINDOW_SECONDS = 0.005
+COALESCE_MAX_BATCH = 1024
+
+# Longest sequence a CUDA graph is specialized for
+GRAPH_MAX_SEQ_LEN = 512
+
+# Query embeddings kept by EmbeddingService.embed_query()
+QUERY_CACHE_SIZE = 1024
+
+
+def _normalize_query(query: str) -> str:
+    """Collapse whitespace so trivially different queries share a cache entry"""
+    return " ".join(query.split())
+
+
+def init_gpu_model(model_name: str = SENTENCE_TRANSFORMER_MODEL):
+    """
+    Load the sentence-transformer onto the GPU in FP16 if CUDA is available
+
+    Args:
+        model_name: Sentence-transformer model to load
+
+    Returns:
+        The resident GPU model, or None when no GPU is available
+    """
+    global _GPU_MODEL, _GPU_MODEL_NAME
+    if _GPU_MODEL is not None:
+        return _GPU_MODEL
+
+    try:
+        import torch
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+
+    if not torch.cuda.is_available():
+        return None
+
+    _GPU_MODEL = SentenceTransformer(model_name, device="cuda").half()
+    _GPU_MODEL_NAME = model_name
+    logger.info(f"Loaded {model_name} on GPU (FP16)")
+    return _GPU_MODEL
+
+
+class _CudaGraphEncoder:
+    """Embedding forward pass captured as a CUDA graph for one fixed batch shape"""
+
+    def __init__(self, model, batch_size: int, max_seq_len: int):
+        import torch
+
+        self.model = model
+        self.batch_size = batch_size
+        self.max_seq_len = max_seq_len
+
+        # Static input buffers the graph reads from on every replay
+        self.static_inputs = {
+            key: tensor.to(model.device)
+            for key, tensor in self._tokenize([""] * batch_size).items()
+        }
+
+        # Warm up on a side stream before capture, as CUDA graphs require
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.no_grad(), torch.cuda.stream(stream):
+            for _ in range(3):
+                model(dict(self.static_inputs))
+        torch.cuda.current_stream().wait_stream(stream)
+
+        self.graph = torch.cuda.CUDAGraph()
+        with torch.no_grad(), torch.cuda.graph(self.graph):
+            self.static_output = model(dict(self.static_inputs))["sentence_embedding"]
+
+    def _tokenize(self, texts: List[str]):
+        return self.model.tokenizer(
+            texts,
+            padding="max_length",
+            truncation=True,
+            max_length=self.max_seq_len,
+            return_tensors="pt"
+        )
+
+    def encode(self, texts: List[str]):
+        import torch
+
+        features = self._tokenize(texts)
+        for key, tensor in self.static_inputs.items():
+            tensor.copy_(features[key], non_blocking=True)
+
+        self.graph.replay()
+        embeddings = torch.nn.functional.normalize(self.static_output.float(), dim=1)
+        return embeddings.cpu().numpy()
+
+
+# Specialized encoders keyed by (model_name, batch_size, max_seq_len);
+# None marks a shape whose capture failed and which stays on eager mode
+_GRAPH_CACHE: Dict[Tuple[str, int, int], Optional[_CudaGraphEncoder]] = {}
+
+
+def _get_graph_encoder(batch_size: int) -> Optional[_CudaGraphEncoder]:
+    """Get or capture the CUDA graph encoder for a batch size"""
+    max_seq_len = min(GRAPH_MAX_SEQ_LEN, _GPU_MODEL.max_seq_length)
+    key = (_GPU_MODEL_NAME, batch_size, max_seq_len)
+
+    if key not in _GRAPH_CACHE:
+        try:
+            _GRAPH_CACHE[key] = _CudaGraphEncoder(_GPU_MODEL, batch_size, max_seq_len)
+            logger.info(f"Captured CUDA graph for {key}")
+        except Exception as e:
+            logger.warning(f"CUDA graph capture failed for {key}, using eager mode: {str(e)}")
+            _GRAPH_CACHE[key] = None
+
+    return _GRAPH_CACHE[key]
+
+
+def _encode_on_gpu(batch: List[str], batch_size: int) -> np.ndarray:
+    """
+    Encode a batch on the resident GPU model
+
+    Full slices of batch_size replay the specialized CUDA graph; the
+    off-shape tail runs eagerly.
+    """
+    full = len(batch) - len(batch) % batch_size
+    encoder = _get_graph_encoder(batch_size) if full else None
+    if encoder is None:
+        full = 0
+
+    parts = [
+        encoder.encode(batch[start:start + batch_size])
+        for start in range(0, full, batch_size)
+    ]
+
+    if full < len(batch):
+        parts.append(_GPU_MODEL.encode(
+            batch[full:],
+            batch_size=COALESCE_MAX_BATCH,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        ))
+
+    return np.concatenate(parts).astype(np.float32, copy=False)
+
+
+class _CoalescingBatcher:
+    """Fuses concurrent embedding requests into large on-device batches"""
+
+    def __init__(self, window: float, max_batch: int):
+        self.window = window
+        self.max_batch = max_batch
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.drainer: Optional[asyncio.Task] = None
+
+    async def embed(self, texts: List[str], batch_size: int) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        await self.queue.put((texts, batch_size, future))
+
+        if self.drainer is None or self.drainer.done():
+            self.drainer = loop.create_task(self._drain())
+
+        return await future
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+
+        while not self.queue.empty():
+            pending = [self.queue.get_nowait()]
+            count = len(pending[0][0])
+            deadline = loop.time() + self.window
+
+            while count < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                count += len(item[0])
+
+            # Each batch_size is a different CUDA graph shape, so requests
+            # are only fused with others that asked for the same one
+            groups: Dict[int, list] = {}
+            for item in pending:
+                groups.setdefault(item[1], []).append(item)
+
+            for batch_size, group in groups.items():
+                await self._encode_group(group, batch_size)
+
+    async def _encode_group(self, group: list, batch_size: int):
+        """Encode requests sharing a batch_size together and resolve their futures"""
+        loop = asyncio.get_running_loop()
+        batch = [text for texts, _, _ in group for text in texts]
+
+        try:
+            embeddings = await loop.run_in_executor(None, _encode_on_gpu, batch, batch_size)
+        except Exception as e:
+            for _, _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for texts, _, future in group:
+            if not future.done():
+                future.set_result(embeddings[offset:offset + len(texts)])
+            offset += len(texts)
+
+
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _CoalescingBatcher]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def embed_coalesced(texts: List[str], batch_size: int = 32) -> np.ndarray:
+    """
+    Embed texts on the resident GPU model, coalescing concurrent callers
+
+    Requests arriving within COALESCE_WINDOW_SECONDS of each other on the
+    same event loop are encoded together, up to COALESCE_MAX_BATCH texts.
+
+    Args:
+        texts: Texts to embed
+        batch_size: Batch shape the CUDA graph is specialized for
+
+    Returns:
+        float32 array of normalized embeddings, shape (len(texts), dim)
+    """
+    if _GPU_MODEL is None:
+        raise RuntimeError("GPU model not initialized. Call init_gpu_model() first")
+
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None:
+        batcher = _CoalescingBatcher(COALESCE_WINDOW_SECONDS, COALESCE_MAX_BATCH)
+        _batchers[loop] = batcher
+
+    return await batcher.embed(texts, batch_size)
 
 
 class EmbeddingService:
@@ -9,6 +269,11 @@ class EmbeddingService:
     
     _model_cache = {}
     
+    # LRU of (embedding_model, normalized query) -> embedding, shared by all
+    # instances; embed_query() runs on executor threads, hence the lock
+    _query_cache: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+    _query_cache_lock = threading.Lock()
+    
     def __init__(self, embedding_model: str = "sentence-transformers"):
         """
         Initialize embedding service
@@ -30,7 +295,7 @@ class EmbeddingService:
             try:
                 from sentence_transformers import SentenceTransformer
                 self.model = SentenceTransformer(
-                    "all-MiniLM-L6-v2"
+                    SENTENCE_TRANSFORMER_MODEL
                 )
             except ImportError:
                 raise ImportError(
@@ -97,7 +362,7 @@ class EmbeddingService:
     
     def embed_query(self, query: str) -> List[float]:
         """
-        Generate embedding for a single query
+        Generate embedding for a single query, reusing cached embeddings
         
         Args:
             query: Query text to embed
@@ -105,15 +370,47 @@ class EmbeddingService:
         Returns:
             Query embedding as a list of floats
         """
-        embeddings = self.embed_documents([query])
-        return embeddings[0] if embeddings else []
+        key = (self.embedding_model, _normalize_query(query))
+        cached = self._get_cached_query(key)
+        if cached is not None:
+            return cached
+        
+        embeddings = self.embed_documents([key[1]])
+        embedding = embeddings[0] if embeddings else []
+        if embedding:
+            with self._query_cache_lock:
+                self._query_cache[key] = embedding
+                if len(self._query_cache) > QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+        return embedding
+    
+    def is_query_cached(self, query: str) -> bool:
+        """
+        Check whether embed_query() would be served from the cache
+        
+        Args:
+            query: Query text
+        
+        Returns:
+            True if an embedding for the query is cached
+        """
+        with self._query_cache_lock:
+            return (self.embedding_model, _normalize_query(query)) in self._query_cache
+    
+    def _get_cached_query(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        """Look up a cached query embedding and mark it recently used"""
+        with self._query_cache_lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+            return cached
     
     def get_model_info(self) -> dict:
         """Get information about the current embedding model"""
         if self.embedding_model == "sentence-transformers":
             return {
                 "type": "sentence-transformers",
-                "model": "all-MiniLM-L6-v2",
+                "model": SENTENCE_TRANSFORMER_MODEL,
                 "dimension": 384
             }
         elif self.embedding_model == "openai":
@@ -123,6 +420,39 @@ class EmbeddingService:
                 "dimension": 1536
             }
         return {"type": "unknown"}
+    
+    def embed_documents_array(
+        self,
+        documents: List[str],
+        batch_size: int = 32
+    ) -> np.ndarray:
+        """
+        Generate embeddings for documents as one contiguous float32 array
+        
+        Args:
+            documents: List of document texts to embed
+            batch_size: Batch size for processing (only for sentence-transformers)
+        
+        Returns:
+            float32 array of shape (len(documents), dim)
+        """
+        if not documents:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        if self.embedding_model == "sentence-transformers":
+            try:
+                embeddings = self.model.encode(
+                    documents,
+                    batch_size=batch_size,
+                    convert_to_numpy=True
+                )
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to embed documents with sentence-transformers: {e}"
+                )
+            return embeddings.astype(np.float32, copy=False)
+        
+        return np.asarray(self.embed_documents(documents, batch_size), dtype=np.float32)
 
 
 class AsyncEmbeddingService(EmbeddingService):
@@ -132,7 +462,7 @@ class AsyncEmbeddingService(EmbeddingService):
         self,
         documents: List[str],
         batch_size: int = 32
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         Asynchronously generate embeddings for documents
         
@@ -141,12 +471,15 @@ class AsyncEmbeddingService(EmbeddingService):
             batch_size: Batch size for processing
         
         Returns:
-            List of embeddings
+            float32 array of embeddings, shape (len(documents), dim)
         """
+        if self.embedding_model == "sentence-transformers" and _GPU_MODEL is not None:
+            return await embed_coalesced(documents, batch_size)
+        
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             None,
-            self.embed_documents,
+            self.embed_documents_array,
             documents,
             batch_size
         )
@@ -161,6 +494,11 @@ class AsyncEmbeddingService(EmbeddingService):
         Returns:
             Query embedding
         """
+        # Cache hits skip the executor hop entirely
+        cached = self._get_cached_query((self.embedding_model, _normalize_query(query)))
+        if cached is not None:
+            return cached
+        
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             None,
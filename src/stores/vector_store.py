@@ -1,10 +1,44 @@
 """Vector database management using ChromeDB for document embeddings and retrieval"""
 
 import os
+import functools
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Union
 import json
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@functools.lru_cache(maxsize=1024)
+def where_filter(
+    project_id: Optional[int] = None,
+    asset_id: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the ChromaDB metadata filter for a project/asset scope
+
+    Filters are cached per argument tuple, so repeated queries reuse the same
+    dict. Callers must not mutate the returned value.
+
+    Args:
+        project_id: Optional project ID to filter by
+        asset_id: Optional asset ID to filter by
+
+    Returns:
+        ChromaDB where clause, or None when no filter applies
+    """
+    if project_id and asset_id:
+        return {"$and": [
+            {"project_id": {"$eq": project_id}},
+            {"asset_id": {"$eq": asset_id}}
+        ]}
+    if project_id:
+        return {"project_id": {"$eq": project_id}}
+    if asset_id:
+        return {"asset_id": {"$eq": asset_id}}
+    return None
+
 
 class VectorStore:
     """Manages vector storage and retrieval using ChromeDB"""
@@ -43,7 +77,7 @@ class VectorStore:
         documents: List[str],
         ids: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
-        embeddings: Optional[List[List[float]]] = None
+        embeddings: Optional[Union[List[List[float]], "np.ndarray"]] = None
     ) -> None:
         """
         Add documents to the vector store
@@ -52,7 +86,7 @@ class VectorStore:
             documents: List of document texts
             ids: List of unique document IDs
             metadatas: Optional list of metadata dicts per document
-            embeddings: Optional pre-computed embeddings
+            embeddings: Optional pre-computed embeddings (list or float32 array)
         """
         if len(documents) != len(ids):
             raise ValueError("Documents and IDs must have same length")
@@ -61,7 +95,7 @@ class VectorStore:
             raise ValueError("Metadatas and documents must have same length")
         
         try:
-            if embeddings:
+            if embeddings is not None and len(embeddings):
                 self.collection.add(
                     documents=documents,
                     ids=ids,
@@ -133,7 +167,7 @@ class VectorStore:
         documents: List[str],
         ids: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
-        embeddings: Optional[List[List[float]]] = None
+        embeddings: Optional[Union[List[List[float]], "np.ndarray"]] = None
     ) -> None:
         """
         Update existing documents in the vector store
@@ -142,13 +176,13 @@ class VectorStore:
             documents: List of updated document texts
             ids: List of document IDs to update
             metadatas: Optional updated metadatas
-            embeddings: Optional pre-computed embeddings
+            embeddings: Optional pre-computed embeddings (list or float32 array)
         """
         if len(documents) != len(ids):
             raise ValueError("Documents and IDs must have same length")
         
         try:
-            if embeddings:
+            if embeddings is not None and len(embeddings):
                 self.collection.update(
                     documents=documents,
                     ids=ids,
@@ -178,3 +212,9 @@ class VectorStore:
             "count": self.count(),
             "metadata": self.collection.metadata
         }
+    
+    def close(self) -> None:
+        """Release the ChromaDB client and its cached system resources"""
+        clear_cache = getattr(self.client, "clear_system_cache", None)
+        if clear_cache is not None:
+            clear_cache()
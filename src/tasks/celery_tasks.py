@@ -2,24 +2,161 @@
 
 import logging
 import asyncio
-from typing import Optional
+from typing import List, Optional
 
-from celery_app import app
+from celery import chord
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy import select
+
+from celery_app import celery_app as app
+from helpers.config import get_settings
 from helpers.database import AsyncSessionLocal
+from helpers.exceptions import ResourceNotFoundException
 from helpers.logger import setup_logger
 from controllers.ProcessingController import ProcessingController
 from controllers.NLPController import NLPController
 from controllers.RAGController import RAGController
+from models.db_models import Asset
+from repositories.project_repository import ProjectRepository
+from stores.embedding_service import init_gpu_model
+from tasks.vectorize_documents import VectorizationTask
 
 logger = setup_logger(__name__)
 
+# Worker-level VectorizationTask shared by all tasks in the process, so the
+# embedding model and ChromaDB client are loaded once rather than per task
+_VTASK: Optional[VectorizationTask] = None
+
+# Idempotency keys and stage markers expire after this many seconds; running
+# tasks restart the window at each retry and pipeline stage
+MARKER_TTL_SECONDS = 3600
+
+_REDIS = None
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    """Set up per-process worker state: event loop policy, GPU model, shared VectorizationTask"""
+    # uvloop backs every asyncio.run() in the task bodies
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        logger.warning("uvloop not installed, using the default asyncio event loop")
+    
+    try:
+        if init_gpu_model() is not None:
+            logger.info("GPU embedding model ready for this worker process")
+    except Exception as e:
+        logger.warning(f"GPU embedding model unavailable, using CPU: {str(e)}")
+    
+    global _VTASK
+    try:
+        _VTASK = VectorizationTask(embedding_model=get_settings().EMBEDDING_MODEL)
+    except Exception as e:
+        logger.warning(f"Shared vectorization task unavailable: {str(e)}")
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**kwargs):
+    """Close the shared vector store when the worker process exits"""
+    global _VTASK
+    if _VTASK is not None:
+        try:
+            _VTASK.vector_store.close()
+        except Exception as e:
+            logger.warning(f"Failed to close vector store: {str(e)}")
+        _VTASK = None
+
 
 def _get_async_session():
     """Get async session for database operations"""
     return AsyncSessionLocal()
 
 
-@app.task(bind=True, max_retries=3, default_retry_delay=60)
+def _get_redis():
+    """Get the Redis client used for idempotency keys and stage markers"""
+    global _REDIS
+    if _REDIS is None:
+        import redis
+        _REDIS = redis.Redis.from_url(get_settings().CELERY_BROKER_URL)
+    return _REDIS
+
+
+def _claim(key: str, task_id: str) -> bool:
+    """
+    Claim an idempotency key for a task
+    
+    Retries and redeliveries of the same task keep their claim; a different
+    task holding the key means the work is already in progress. When Redis
+    is unreachable the claim is granted so tasks still run.
+    """
+    try:
+        client = _get_redis()
+        if client.set(key, task_id, nx=True, ex=MARKER_TTL_SECONDS):
+            return True
+        owner = client.get(key)
+        if owner is not None and owner.decode() != task_id:
+            return False
+        # A retry starts a fresh TTL window for the claim it still holds
+        client.expire(key, MARKER_TTL_SECONDS)
+        return True
+    except Exception as e:
+        logger.warning(f"Idempotency check unavailable for {key}: {str(e)}")
+        return True
+
+
+def _stage_done(key: str) -> bool:
+    """Check whether a pipeline stage completion marker exists"""
+    try:
+        return bool(_get_redis().exists(key))
+    except Exception as e:
+        logger.warning(f"Stage marker check unavailable for {key}: {str(e)}")
+        return False
+
+
+def _mark_stage_done(key: str):
+    """Record a pipeline stage as completed"""
+    try:
+        _get_redis().set(key, 1, ex=MARKER_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Failed to record stage marker {key}: {str(e)}")
+
+
+def _refresh(*keys: str):
+    """Restart the TTL of keys held by a running task, so long runs keep them"""
+    try:
+        client = _get_redis()
+        for key in keys:
+            client.expire(key, MARKER_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Failed to refresh keys {keys}: {str(e)}")
+
+
+def _release(*keys: str):
+    """Remove idempotency keys and stage markers once a task has finished"""
+    try:
+        _get_redis().delete(*keys)
+    except Exception as e:
+        logger.warning(f"Failed to release keys {keys}: {str(e)}")
+
+
+def _run_process_asset(project_id: int, asset_id: int, chunk_size: int, chunk_overlap: int):
+    """Process a single asset in a fresh session"""
+    async def process():
+        async with _get_async_session() as session:
+            controller = ProcessingController(session)
+            return await controller.process_asset(
+                project_id=project_id,
+                asset_id=asset_id,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap
+            )
+    
+    return asyncio.run(process())
+
+
+@app.task(bind=True, max_retries=3, default_retry_delay=60, acks_late=True, reject_on_worker_lost=True)
 def process_asset_task(self, project_id: int, asset_id: int, chunk_size: int = 512, chunk_overlap: int = 50):
     """
     Background task to process an asset and create chunks
@@ -33,63 +170,152 @@ def process_asset_task(self, project_id: int, asset_id: int, chunk_size: int = 5
     Returns:
         Dictionary with processing results
     """
+    idempotency_key = f"rag:{project_id}:{asset_id}"
+    if not _claim(idempotency_key, self.request.id):
+        logger.info(f"Asset {asset_id} is already being processed, skipping")
+        return {"status": "duplicate", "project_id": project_id, "asset_id": asset_id}
+    
     try:
         logger.info(f"Processing asset {asset_id} in project {project_id}")
-        
-        async def process():
-            async with _get_async_session() as session:
-                controller = ProcessingController(session)
-                return await controller.process_asset(
-                    project_id=project_id,
-                    asset_id=asset_id,
-                    chunk_size=chunk_size,
-                    chunk_overlap=chunk_overlap
-                )
-        
-        result = asyncio.run(process())
+        result = _run_process_asset(project_id, asset_id, chunk_size, chunk_overlap)
+        _release(idempotency_key)
         logger.info(f"Asset processing complete: {result}")
         return result
         
     except Exception as e:
         logger.error(f"Asset processing failed: {str(e)}")
+        if self.request.retries >= self.max_retries:
+            # Out of retries: free the key so the asset can be resubmitted
+            _release(idempotency_key)
         raise self.retry(exc=e, countdown=60)
 
 
-@app.task(bind=True, max_retries=3, default_retry_delay=60)
-def batch_process_assets_task(self, project_id: int, chunk_size: int = 512, chunk_overlap: int = 50):
+@app.task(acks_late=True, reject_on_worker_lost=True)
+def _process_batch_asset(project_id: int, asset_id: int, chunk_size: int = 512, chunk_overlap: int = 50):
+    """
+    Chord header task for batch processing
+
+    Failures are reported in the result instead of raised, so one bad
+    asset does not cancel the aggregation for the rest of the batch.
+    """
+    try:
+        return _run_process_asset(project_id, asset_id, chunk_size, chunk_overlap)
+    except Exception as e:
+        logger.error(f"Failed to process asset {asset_id}: {str(e)}")
+        return {"status": "failed", "project_id": project_id, "asset_id": asset_id, "error": str(e)}
+
+
+@app.task(acks_late=True, reject_on_worker_lost=True)
+def _aggregate_results(results: List[dict], project_id: int, vectorize: bool = False):
+    """
+    Chord callback summing the per-asset processing results
+    
+    Args:
+        results: Results of the per-asset header tasks
+        project_id: Project ID
+        vectorize: Queue vectorization of the project's chunks afterwards
+        
+    Returns:
+        Dictionary with batch processing results
+    """
+    processed = [r for r in results if r.get("status") == "success"]
+    summary = {
+        "status": "success",
+        "project_id": project_id,
+        "total_assets": len(results),
+        "processed_assets": len(processed),
+        "failed_assets": len(results) - len(processed),
+        "chunks_created": sum(r.get("chunks_created", 0) for r in processed),
+        "results": processed
+    }
+    logger.info(
+        f"Batch processing complete for project {project_id}: "
+        f"{summary['processed_assets']} successful, {summary['failed_assets']} failed"
+    )
+    
+    if vectorize and processed:
+        vectorize_chunks_task.delay(project_id)
+    
+    return summary
+
+
+@app.task(bind=True, max_retries=3, default_retry_delay=60, acks_late=True, reject_on_worker_lost=True)
+def batch_process_assets_task(
+    self,
+    project_id: int,
+    chunk_size: int = 512,
+    chunk_overlap: int = 50,
+    vectorize: bool = False
+):
     """
     Background task to batch process all unprocessed assets in a project
     
+    Each asset is processed by its own task in parallel across the worker
+    pool, and the results are aggregated by a chord callback.
+    
     Args:
         project_id: Project ID
         chunk_size: Size for chunking
         chunk_overlap: Overlap between chunks
+        vectorize: Queue vectorization once all assets are processed
         
     Returns:
-        Dictionary with batch processing results
+        Dictionary with the chord ID and the number of assets dispatched
     """
     try:
         logger.info(f"Batch processing assets for project {project_id}")
         
-        async def process():
+        async def fetch_asset_ids():
             async with _get_async_session() as session:
-                controller = ProcessingController(session)
-                return await controller.batch_process_assets(
-                    project_id=project_id,
-                    chunk_size=chunk_size,
-                    chunk_overlap=chunk_overlap
+                # Verify project exists
+                project = await ProjectRepository(session).get_project(project_id)
+                if not project:
+                    raise ResourceNotFoundException("Project", project_id)
+                
+                result = await session.execute(
+                    select(Asset.id).where(
+                        Asset.project_id == project_id,
+                        Asset.is_processed == False
+                    )
                 )
+                return result.scalars().all()
         
-        result = asyncio.run(process())
-        logger.info(f"Batch processing complete: {result}")
-        return result
+        asset_ids = asyncio.run(fetch_asset_ids())
+        
+        if not asset_ids:
+            logger.info(f"No unprocessed assets for project {project_id}")
+            return {
+                "status": "success",
+                "project_id": project_id,
+                "total_assets": 0,
+                "processed_assets": 0,
+                "failed_assets": 0,
+                "results": []
+            }
+        
+        header = [
+            _process_batch_asset.s(project_id, asset_id, chunk_size, chunk_overlap)
+            for asset_id in asset_ids
+        ]
+        result = chord(header)(_aggregate_results.s(project_id, vectorize))
+        
+        logger.info(f"Dispatched {len(asset_ids)} assets for project {project_id}")
+        return {
+            "status": "dispatched",
+            "project_id": project_id,
+            "total_assets": len(asset_ids),
+            "chord_id": result.id
+        }
         
+    except ResourceNotFoundException:
+        # A missing project won't appear on retry
+        raise
     except Exception as e:
         logger.error(f"Batch processing failed: {str(e)}")
         raise self.retry(exc=e, countdown=60)
 
 
-@app.task(bind=True, max_retries=3, default_retry_delay=60)
+@app.task(bind=True, max_retries=3, default_retry_delay=60, acks_late=True, reject_on_worker_lost=True)
 def vectorize_chunks_task(self, project_id: int, asset_id: Optional[int] = None, batch_size: int = 32):
     """
     Background task to vectorize chunks for a project or asset
@@ -107,7 +333,7 @@ def vectorize_chunks_task(self, project_id: int, asset_id: Optional[int] = None,
         
         async def vectorize():
             async with _get_async_session() as session:
-                controller = NLPController(session)
+                controller = NLPController(session, vtask=_VTASK)
                 return await controller.vectorize_chunks(
                     project_id=project_id,
                     asset_id=asset_id,
@@ -123,7 +349,7 @@ def vectorize_chunks_task(self, project_id: int, asset_id: Optional[int] = None,
         raise self.retry(exc=e, countdown=60)
 
 
-@app.task(bind=True, max_retries=3, default_retry_delay=60)
+@app.task(bind=True, max_retries=3, default_retry_delay=60, acks_late=True, reject_on_worker_lost=True)
 def save_embeddings_task(self, project_id: int, asset_id: Optional[int] = None):
     """
     Background task to save embeddings from ChromeDB to PostgreSQL
@@ -140,7 +366,7 @@ def save_embeddings_task(self, project_id: int, asset_id: Optional[int] = None):
         
         async def save():
             async with _get_async_session() as session:
-                controller = RAGController(session)
+                controller = RAGController(session, vtask=_VTASK)
                 return await controller.save_embeddings_to_db(
                     project_id=project_id,
                     asset_id=asset_id
@@ -155,7 +381,7 @@ def save_embeddings_task(self, project_id: int, asset_id: Optional[int] = None):
         raise self.retry(exc=e, countdown=60)
 
 
-@app.task(bind=True, max_retries=2, default_retry_delay=300)
+@app.task(bind=True, max_retries=2, default_retry_delay=300, acks_late=True, reject_on_worker_lost=True)
 def full_rag_pipeline_task(self, project_id: int, chunk_size: int = 512):
     """
     Background task to execute full RAG pipeline:
@@ -170,6 +396,14 @@ def full_rag_pipeline_task(self, project_id: int, chunk_size: int = 512):
     Returns:
         Dictionary with pipeline results
     """
+    idempotency_key = f"rag:{project_id}:pipeline"
+    processed_key = f"rag:{project_id}:processed"
+    vectorized_key = f"rag:{project_id}:vectorized"
+    
+    if not _claim(idempotency_key, self.request.id):
+        logger.info(f"RAG pipeline already running for project {project_id}, skipping")
+        return {"status": "duplicate", "project_id": project_id}
+    
     try:
         logger.info(f"Starting full RAG pipeline for project {project_id}")
         
@@ -177,35 +411,55 @@ def full_rag_pipeline_task(self, project_id: int, chunk_size: int = 512):
             async with _get_async_session() as session:
                 results = {}
                 
+                # Stages completed by an earlier attempt of this task are
+                # skipped, so a retry resumes where the last one stopped
+                
                 # Step 1: Process assets
-                logger.info("Step 1: Processing assets...")
-                processor = ProcessingController(session)
-                processing_result = await processor.batch_process_assets(
-                    project_id=project_id,
-                    chunk_size=chunk_size
-                )
-                results["processing"] = processing_result
+                if _stage_done(processed_key):
+                    logger.info("Step 1: Assets already processed, skipping")
+                    results["processing"] = {"status": "skipped"}
+                else:
+                    logger.info("Step 1: Processing assets...")
+                    processor = ProcessingController(session)
+                    processing_result = await processor.batch_process_assets(
+                        project_id=project_id,
+                        chunk_size=chunk_size
+                    )
+                    results["processing"] = processing_result
+                    _mark_stage_done(processed_key)
+                _refresh(idempotency_key, processed_key)
                 
                 # Step 2: Vectorize chunks
-                logger.info("Step 2: Vectorizing chunks...")
-                nlp = NLPController(session)
-                vectorization_result = await nlp.vectorize_chunks(project_id)
-                results["vectorization"] = vectorization_result
+                if _stage_done(vectorized_key):
+                    logger.info("Step 2: Chunks already vectorized, skipping")
+                    results["vectorization"] = {"status": "skipped"}
+                else:
+                    logger.info("Step 2: Vectorizing chunks...")
+                    nlp = NLPController(session, vtask=_VTASK)
+                    vectorization_result = await nlp.vectorize_chunks(project_id)
+                    results["vectorization"] = vectorization_result
+                    _mark_stage_done(vectorized_key)
+                _refresh(idempotency_key, processed_key, vectorized_key)
                 
                 # Step 3: Save embeddings
                 logger.info("Step 3: Saving embeddings to PostgreSQL...")
-                rag = RAGController(session)
+                rag = RAGController(session, vtask=_VTASK)
                 embedding_result = await rag.save_embeddings_to_db(project_id)
                 results["embeddings"] = embedding_result
                 
                 return results
         
         result = asyncio.run(pipeline())
+        _release(idempotency_key, processed_key, vectorized_key)
         logger.info(f"Full RAG pipeline complete: {result}")
         return result
         
     except Exception as e:
         logger.error(f"Full RAG pipeline failed: {str(e)}")
+        if self.request.retries >= self.max_retries:
+            # Out of retries: drop the claim and the stage markers, so a new
+            # run starts from scratch instead of skipping unfinished stages
+            _release(idempotency_key, processed_key, vectorized_key)
         raise self.retry(exc=e, countdown=300)
 
 
@@ -7,6 +7,9 @@ from datetime import datetime
 from helpers.logger import logger
 import asyncio
 
+# Maximum number of user deletions run at once
+GDPR_DELETION_CONCURRENCY = 10
+
 @shared_task(name="tasks.process_gdpr_deletions")
 def process_gdpr_deletions():
     """
@@ -19,23 +22,30 @@ def process_gdpr_deletions():
                 logger.info("Starting GDPR deletion task")
                 
                 # Find pending requests that are due
-                stmt = select(DataDeletionRequest).where(
+                stmt = select(DataDeletionRequest.user_id).where(
                     DataDeletionRequest.status == "pending",
                     DataDeletionRequest.scheduled_at <= datetime.utcnow()
                 )
                 result = await db.execute(stmt)
-                requests = result.scalars().all()
-                
-                logger.info(f"Found {len(requests)} pending deletion requests")
-                
-                for req in requests:
+                user_ids = result.scalars().all()
+            
+            logger.info(f"Found {len(user_ids)} pending deletion requests")
+            
+            # Deletions are independent, so run them concurrently, each in
+            # its own session, bounded to stay within the DB pool
+            sem = asyncio.Semaphore(GDPR_DELETION_CONCURRENCY)
+            
+            async def _delete(user_id):
+                async with sem, AsyncSessionLocal() as session:
                     try:
-                        logger.info(f"Processing deletion for user {req.user_id}")
-                        await GDPRController.delete_user_data(db, req.user_id)
+                        logger.info(f"Processing deletion for user {user_id}")
+                        await GDPRController.delete_user_data(session, user_id)
                     except Exception as e:
-                        logger.error(f"Error processing deletion for user {req.user_id}: {e}")
-                
-                logger.info("GDPR deletion task completed")
+                        logger.error(f"Error processing deletion for user {user_id}: {e}")
+            
+            await asyncio.gather(*(_delete(user_id) for user_id in user_ids))
+            
+            logger.info("GDPR deletion task completed")
         except Exception as e:
             logger.error(f"Critical error in GDPR deletion task execution: {e}")
 
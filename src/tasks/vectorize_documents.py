@@ -3,15 +3,31 @@
 import asyncio
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Row, select, lambda_stmt
 
-from stores.vector_store import VectorStore
+from stores.vector_store import VectorStore, where_filter
 from stores.embedding_service import AsyncEmbeddingService
 from models.db_models import Chunk, Asset, Project
-from helpers.logger import get_logger
+from helpers.logger import setup_logger
 
 
-logger = get_logger(__name__)
+logger = setup_logger(__name__)
+
+# Cached chunk-selection statement; filters are appended as lambdas so the
+# compiled SQL is reused and project/asset IDs become bound parameters.
+# Only the columns vectorization reads are selected, as plain rows, so no
+# ORM instances or identity-map entries are built
+_CHUNK_STMT = lambda_stmt(lambda: select(
+    Chunk.id,
+    Chunk.content,
+    Chunk.asset_id,
+    Chunk.project_id,
+    Chunk.chunk_index,
+    Chunk.token_count
+))
+
+# Rows fetched per round trip when streaming chunks
+STREAM_YIELD_PER = 1000
 
 
 class VectorizationTask:
@@ -56,18 +72,37 @@ class VectorizationTask:
             f"Starting vectorization: project_id={project_id}, asset_id={asset_id}"
         )
         
-        query = select(Chunk)
+        query = _CHUNK_STMT
         
         if project_id:
-            query = query.where(Chunk.project_id == project_id)
+            query = query + (lambda s: s.where(Chunk.project_id == project_id))
         
         if asset_id:
-            query = query.where(Chunk.asset_id == asset_id)
-        
-        result = await session.execute(query)
-        chunks = result.scalars().all()
-        
-        if not chunks:
+            query = query + (lambda s: s.where(Chunk.asset_id == asset_id))
+        
+        # Stream rows through a server-side cursor and embed in bounded
+        # batches so peak memory does not grow with the collection size
+        flush_size = batch_size * 4
+        chunks_processed = 0
+        embedding_dimension = 0
+        pending = []
+        
+        rows = await session.stream(
+            query,
+            execution_options={"yield_per": STREAM_YIELD_PER}
+        )
+        async for chunk in rows:
+            pending.append(chunk)
+            if len(pending) >= flush_size:
+                embedding_dimension = await self._flush_chunks(pending, batch_size)
+                chunks_processed += len(pending)
+                pending = []
+        
+        if pending:
+            embedding_dimension = await self._flush_chunks(pending, batch_size)
+            chunks_processed += len(pending)
+        
+        if not chunks_processed:
             logger.warning("No chunks found to vectorize")
             return {
                 "status": "no_chunks",
@@ -75,6 +110,31 @@ class VectorizationTask:
                 "chunks_vectorized": 0
             }
         
+        self.vector_store.persist()
+        
+        logger.info(
+            f"Vectorization completed: {chunks_processed} chunks processed, "
+            f"{chunks_processed} embeddings created"
+        )
+        
+        return {
+            "status": "success",
+            "chunks_processed": chunks_processed,
+            "chunks_vectorized": chunks_processed,
+            "embedding_dimension": embedding_dimension
+        }
+    
+    async def _flush_chunks(self, chunks: List[Row], batch_size: int) -> int:
+        """
+        Embed a batch of chunks and add them to the vector store
+        
+        Args:
+            chunks: Chunk rows to embed
+            batch_size: Batch size for embedding generation
+        
+        Returns:
+            Embedding dimension
+        """
         documents = [chunk.content for chunk in chunks]
         chunk_ids = [f"chunk_{chunk.id}" for chunk in chunks]
         
@@ -113,19 +173,7 @@ class VectorizationTask:
             logger.error(f"Failed to add documents to vector store: {e}")
             raise
         
-        self.vector_store.persist()
-        
-        logger.info(
-            f"Vectorization completed: {len(documents)} chunks processed, "
-            f"{len(embeddings)} embeddings created"
-        )
-        
-        return {
-            "status": "success",
-            "chunks_processed": len(chunks),
-            "chunks_vectorized": len(embeddings),
-            "embedding_dimension": len(embeddings[0]) if embeddings else 0
-        }
+        return len(embeddings[0]) if len(embeddings) else 0
     
     async def search_similar_chunks(
         self,
@@ -152,15 +200,11 @@ class VectorizationTask:
             logger.error(f"Query embedding failed: {e}")
             raise
         
-        where = None
-        if project_id:
-            where = {"project_id": {"$eq": project_id}}
-        
         try:
             results = self.vector_store.query(
                 query_embedding=query_embedding,
                 n_results=n_results,
-                where=where
+                where=where_filter(project_id)
             )
         except Exception as e:
             logger.error(f"Vector store query failed: {e}")
@@ -0,0 +1,19 @@
+
+import asyncio
+import os
+
+# Cheap argon2id parameters for test runs; must be set before helpers.password loads
+os.environ.setdefault("PW_TIME_COST", "1")
+os.environ.setdefault("PW_MEMORY_COST", "8")
+os.environ.setdefault("PW_PARALLELISM", "1")
+
+from test_auth_docker import test_auth_logic
+from test_bcrypt_docker import test_bcrypt
+from test_jwt_docker import test_jwt
+
+async def test_all():
+    # One interpreter and event loop for all three checks
+    await asyncio.gather(test_auth_logic(), test_bcrypt(), test_jwt())
+
+if __name__ == "__main__":
+    asyncio.run(test_all())
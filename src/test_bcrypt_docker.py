@@ -1,5 +1,12 @@
 
 import asyncio
+import os
+
+# Cheap argon2id parameters for test runs; must be set before helpers.password loads
+os.environ.setdefault("PW_TIME_COST", "1")
+os.environ.setdefault("PW_MEMORY_COST", "8")
+os.environ.setdefault("PW_PARALLELISM", "1")
+
 from helpers.password import hash_password, verify_password
 
 async def test_bcrypt():
@@ -1,7 +1,6 @@
 
 import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy import select, update
 import os
 import sys
@@ -15,8 +14,9 @@ from helpers.password import hash_password
 
 async def update_password():
     DATABASE_URL = os.getenv("DATABASE_URL")
-    engine = create_async_engine(DATABASE_URL)
-    AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    # Single-shot script: one pooled connection, no pre-ping
+    engine = create_async_engine(DATABASE_URL, pool_pre_ping=False, pool_size=1, max_overflow=0)
+    AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
     
     async with AsyncSessionLocal() as session:
         print("Updating admin password to 'Password@123'...")
@@ -1,13 +1,236 @@
 """Document processing utilities for text extraction and chunking"""
 
 import os
+import re
+import functools
 from typing import List, Tuple, Optional
 from pathlib import Path
 import logging
 
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=4)
+def _get_encoding(name: str = "cl100k_base"):
+    """Get a tiktoken encoding, built once per process and name"""
+    return tiktoken.get_encoding(name)
+
+
+# Keyed on chunk text (repeated headers, footers, FAQ entries), never whole
+# documents; ProcessingController clears it after each asset
+@functools.lru_cache(maxsize=1024)
+def count_tokens(text: str) -> int:
+    """
+    Count approximate tokens in text, memoized for repeated chunks
+    
+    Args:
+        text: Text to count
+        
+    Returns:
+        Estimated token count
+    """
+    if tiktoken is None:
+        logger.warning("tiktoken not available, using character-based estimation")
+        return len(text) // 4
+    
+    return len(_get_encoding().encode(text))
+
+
+# Paragraph separator: a blank line, allowing whitespace/CR on it or extra blank lines
+_PARA_SPLIT = re.compile(r'\n\s*\n')
+
+# JSON files larger than this are streamed with ijson instead of json.load
+JSON_STREAM_THRESHOLD = 10 * 1024 * 1024
+
+# Texts at least this many characters long are tokenized in parallel windows
+PARALLEL_ENCODE_THRESHOLD = 200_000
+
+
+def _merge_windows(
+    left: Tuple[List[int], List[int]],
+    right: Tuple[List[int], List[int]],
+    center: int,
+    radius: int
+) -> Optional[int]:
+    """
+    Find where to switch from the left window's tokens to the right's
+    
+    The cut is a character position inside the overlap where both windows
+    start a token and agree on the tokens either side of it, so tokens left
+    of the cut come from the left window and the rest from the right.
+    
+    Args:
+        left: (tokens, absolute start offsets) of the left window
+        right: (tokens, absolute start offsets) of the right window
+        center: Middle of the overlap region
+        radius: Search distance either side of center
+        
+    Returns:
+        Absolute character offset of the cut, or None if no safe cut exists
+    """
+    left_tokens, left_offsets = left
+    right_tokens, right_offsets = right
+    left_index = {offset: i for i, offset in enumerate(left_offsets)}
+    
+    candidates = []
+    for j, offset in enumerate(right_offsets):
+        if j == 0 or abs(offset - center) > radius:
+            continue
+        i = left_index.get(offset)
+        if (
+            i is not None and i > 0
+            and left_tokens[i] == right_tokens[j]
+            and left_tokens[i - 1] == right_tokens[j - 1]
+        ):
+            candidates.append(offset)
+    
+    if not candidates:
+        return None
+    return min(candidates, key=lambda offset: abs(offset - center))
+
+
+def _parallel_encode(
+    text: str,
+    encoding,
+    n_workers: int,
+    overlap_chars: int
+) -> Optional[Tuple[int, ...]]:
+    """
+    Tokenize a long text as overlapping windows in parallel, then merge
+    
+    Windows are encoded with encode_batch, whose BPE runs outside the GIL
+    on a thread pool. Adjacent windows are stitched at a token boundary
+    both agree on inside their overlap (see _merge_windows).
+    
+    Args:
+        text: Text to tokenize
+        encoding: tiktoken encoding
+        n_workers: Number of windows / encoder threads
+        overlap_chars: Characters each window extends past its neighbour
+        
+    Returns:
+        Token IDs, or None when a window boundary cannot be merged safely
+        and the caller should encode serially
+    """
+    if n_workers < 2:
+        return None
+    
+    width = -(-len(text) // n_workers)
+    bounds = [
+        (max(0, k * width - overlap_chars), min(len(text), (k + 1) * width + overlap_chars))
+        for k in range(n_workers)
+        if k * width < len(text)
+    ]
+    
+    encoded = encoding.encode_batch(
+        [text[start:end] for start, end in bounds],
+        num_threads=len(bounds)
+    )
+    
+    windows = []
+    for (start, _), tokens in zip(bounds, encoded):
+        _, offsets = encoding.decode_with_offsets(tokens)
+        windows.append((tokens, [start + offset for offset in offsets]))
+    
+    merged: List[int] = []
+    cut = 0
+    for k in range(len(windows) - 1):
+        next_cut = _merge_windows(windows[k], windows[k + 1], (k + 1) * width, overlap_chars // 2)
+        if next_cut is None:
+            return None
+        tokens, offsets = windows[k]
+        merged.extend(t for t, offset in zip(tokens, offsets) if cut <= offset < next_cut)
+        cut = next_cut
+    
+    tokens, offsets = windows[-1]
+    merged.extend(t for t, offset in zip(tokens, offsets) if offset >= cut)
+    return tuple(merged)
+
+
+def clear_token_caches():
+    """Clear memoized token counts, e.g. after each processed asset"""
+    count_tokens.cache_clear()
+
+
+def _extract_pypdf(file_path: str) -> str:
+    """Extract PDF text with pypdf"""
+    try:
+        from pypdf import PdfReader
+        reader = PdfReader(file_path)
+        parts = []
+        for i, page in enumerate(reader.pages):
+            page_text = page.extract_text()
+            if page_text:
+                parts.append(page_text)
+                parts.append(f"\n[Page {i + 1}]\n")
+        
+        return "".join(parts).strip()
+    except Exception as e:
+        logger.error(f"PDF extraction failed for {file_path}: {str(e)}")
+        raise Exception(f"Failed to extract text from PDF: {str(e)}")
+
+
+def _extract_pymupdf(file_path: str) -> str:
+    """Extract PDF text with PyMuPDF, falling back to pypdf on failure or empty output"""
+    try:
+        parts = []
+        with fitz.open(file_path) as pdf:
+            for page_num, page in enumerate(pdf.pages()):
+                parts.append(page.get_text("text", flags=_PDF_TEXT_FLAGS, sort=False))
+                parts.append(f"\n[Page {page_num + 1}]\n")
+        
+        text = "".join(parts)
+        if text.strip():
+            return text.strip()
+    except Exception as e:
+        logger.warning(f"PyMuPDF failed for {file_path}: {str(e)}, trying pypdf")
+    
+    return _extract_pypdf(file_path)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_sent_tokenize():
+    """
+    Resolve nltk's sentence tokenizer once per process
+    
+    Returns:
+        sent_tokenize, or None when nltk is not installed
+    """
+    try:
+        import nltk
+        from nltk.tokenize import sent_tokenize
+    except ImportError:
+        logger.warning("nltk not available, using period-based sentence splitting")
+        return None
+    
+    try:
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        nltk.download('punkt', quiet=True)
+    
+    return sent_tokenize
+
+
+# PDF backend chosen once at import: PyMuPDF when installed, else pypdf
+if fitz is not None:
+    # Plain text only: no image blocks, dehyphenation or clipping pass
+    _PDF_TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_PRESERVE_LIGATURES
+    _pdf_extract = _extract_pymupdf
+else:
+    logger.warning("PyMuPDF not installed, falling back to pypdf")
+    _pdf_extract = _extract_pypdf
+
+
 class DocumentProcessor:
     """Processor for extracting text from various document formats"""
     
@@ -29,39 +252,7 @@ class DocumentProcessor:
         Raises:
             Exception: If PDF extraction fails
         """
-        text = ""
-        
-        # Try PyMuPDF (fitz) first as it's generally better
-        try:
-            import fitz
-            with fitz.open(file_path) as pdf:
-                for page_num in range(len(pdf)):
-                    page = pdf[page_num]
-                    text += page.get_text()
-                    text += f"\n[Page {page_num + 1}]\n"
-            
-            if text.strip():
-                return text.strip()
-        except ImportError:
-            logger.warning("PyMuPDF not installed, falling back to pypdf")
-        except Exception as e:
-            logger.warning(f"PyMuPDF failed for {file_path}: {str(e)}, trying pypdf")
-
-        # Fallback to pypdf
-        try:
-            from pypdf import PdfReader
-            reader = PdfReader(file_path)
-            text = ""
-            for i, page in enumerate(reader.pages):
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text
-                    text += f"\n[Page {i + 1}]\n"
-            
-            return text.strip()
-        except Exception as e:
-            logger.error(f"PDF extraction failed for {file_path}: {str(e)}")
-            raise Exception(f"Failed to extract text from PDF: {str(e)}")
+        return _pdf_extract(file_path)
     
     @staticmethod
     def extract_text_from_txt(file_path: str) -> str:
@@ -115,17 +306,13 @@ class DocumentProcessor:
         
         try:
             doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + " | "
-                    text += "\n"
-            
-            return text.strip()
+            paragraphs = "\n".join(paragraph.text for paragraph in doc.paragraphs)
+            tables = "\n".join(
+                " | ".join(cell.text for cell in row.cells)
+                for table in doc.tables
+                for row in table.rows
+            )
+            return (paragraphs + "\n" + tables).strip()
         except Exception as e:
             logger.error(f"DOCX extraction failed for {file_path}: {str(e)}")
             raise Exception(f"Failed to extract text from DOCX: {str(e)}")
@@ -147,10 +334,7 @@ class DocumentProcessor:
             from docx import Document
             # Try as docx first (in case it's just misnamed)
             doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs).strip()
         except Exception:
             logger.warning(f"Legacy DOC format detected for {file_path}. python-docx cannot process binary DOC files.")
             raise Exception(
@@ -170,7 +354,14 @@ class DocumentProcessor:
             JSON content as text
         """
         import json
+        
         try:
+            if os.path.getsize(file_path) > JSON_STREAM_THRESHOLD:
+                try:
+                    return DocumentProcessor._extract_text_from_large_json(file_path)
+                except ImportError:
+                    logger.warning("ijson not available, loading large JSON into memory")
+            
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 if isinstance(data, dict):
@@ -183,6 +374,47 @@ class DocumentProcessor:
             logger.error(f"JSON parsing failed for {file_path}: {str(e)}")
             raise Exception(f"Failed to extract text from JSON: {str(e)}")
     
+    @staticmethod
+    def _extract_text_from_large_json(file_path: str) -> str:
+        """
+        Stream a large JSON file to text with ijson, one top-level item at a time
+        
+        Produces the same text as the in-memory path in extract_text_from_json,
+        without building the whole document as Python objects.
+        
+        Args:
+            file_path: Path to JSON file
+            
+        Returns:
+            JSON content as text
+            
+        Raises:
+            ImportError: If ijson not installed
+        """
+        import json
+        import ijson
+        
+        with open(file_path, 'rb') as f:
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            f.seek(0)
+            
+            if first == b'{':
+                # Rebuild json.dumps(data, indent=2) one member at a time
+                members = [
+                    f'  {json.dumps(key)}: ' + json.dumps(value, indent=2).replace("\n", "\n  ")
+                    for key, value in ijson.kvitems(f, '', use_float=True)
+                ]
+                return "{\n" + ",\n".join(members) + "\n}" if members else "{}"
+            elif first == b'[':
+                return "\n".join(
+                    json.dumps(item, indent=2)
+                    for item in ijson.items(f, 'item', use_float=True)
+                )
+            else:
+                return "\n".join(str(item) for item in ijson.items(f, '', use_float=True))
+    
     @staticmethod
     def extract_text(file_path: str) -> str:
         """
@@ -237,19 +469,19 @@ class ChunkingStrategy:
         Returns:
             List of text chunks
         """
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = min(start + chunk_size, len(text))
-            chunk = text[start:end]
-            
-            if len(chunk) > DocumentProcessor.MIN_CHUNK_SIZE:
-                chunks.append(chunk)
-            
-            start += chunk_size - overlap
+        min_size = DocumentProcessor.MIN_CHUNK_SIZE
+        if chunk_size <= min_size:
+            return []
         
-        return chunks
+        # Window i covers text[i*step : i*step + chunk_size]; only the tail
+        # windows can be shorter than chunk_size, so filter on the remainder
+        text_length = len(text)
+        step = chunk_size - overlap
+        return [
+            text[start:start + chunk_size]
+            for start in range(0, text_length, step)
+            if text_length - start > min_size
+        ]
     
     @staticmethod
     def chunk_by_tokens(
@@ -268,31 +500,61 @@ class ChunkingStrategy:
         Returns:
             List of text chunks
         """
-        try:
-            import tiktoken
-            encoding = tiktoken.get_encoding("cl100k_base")
-        except ImportError:
+        return ChunkingStrategy.encode_and_chunk(text, max_tokens, overlap_tokens)[1]
+    
+    @staticmethod
+    def encode_and_chunk(
+        text: str,
+        max_tokens: int = 512,
+        overlap_tokens: int = 50
+    ) -> Tuple[int, List[str], List[int]]:
+        """
+        Count tokens and chunk by tokens from a single encoding pass
+        
+        Prefer this over separate count_tokens() and chunk_by_tokens()
+        calls on the same text, including count_tokens() on each chunk.
+        
+        Args:
+            text: Text to chunk
+            max_tokens: Maximum tokens per chunk (approximate)
+            overlap_tokens: Overlap in tokens
+            
+        Returns:
+            Tuple of (token count of the whole text, list of text chunks,
+            token count of each chunk)
+        """
+        if tiktoken is None:
             logger.warning("tiktoken not available, using character-based estimation")
             avg_token_length = 4
             char_size = max_tokens * avg_token_length
             overlap_chars = overlap_tokens * avg_token_length
-            return ChunkingStrategy.chunk_by_size(text, char_size, overlap_chars)
+            chunks = ChunkingStrategy.chunk_by_size(text, char_size, overlap_chars)
+            return (
+                len(text) // avg_token_length,
+                chunks,
+                [len(chunk) // avg_token_length for chunk in chunks]
+            )
         
-        chunks = []
-        tokens = encoding.encode(text)
+        min_size = DocumentProcessor.MIN_CHUNK_SIZE
+        encoding = _get_encoding()
+        tokens = None
+        if len(text) >= PARALLEL_ENCODE_THRESHOLD:
+            tokens = _parallel_encode(
+                text,
+                encoding,
+                n_workers=os.cpu_count() or 1,
+                overlap_chars=max_tokens * 8
+            )
+        if tokens is None:
+            tokens = encoding.encode(text)
         
-        start = 0
-        while start < len(tokens):
-            end = min(start + max_tokens, len(tokens))
-            token_chunk = tokens[start:end]
-            chunk_text = encoding.decode(token_chunk)
-            
-            if len(chunk_text) > DocumentProcessor.MIN_CHUNK_SIZE:
-                chunks.append(chunk_text)
-            
-            start += max_tokens - overlap_tokens
+        # Slice every window up front and decode them in one multi-threaded call
+        step = max_tokens - overlap_tokens
+        windows = [list(tokens[start:start + max_tokens]) for start in range(0, len(tokens), step)]
+        texts = encoding.decode_batch(windows)
         
-        return chunks
+        kept = [(chunk, len(window)) for chunk, window in zip(texts, windows) if len(chunk) > min_size]
+        return len(tokens), [chunk for chunk, _ in kept], [count for _, count in kept]
     
     @staticmethod
     def chunk_by_sentences(
@@ -311,30 +573,21 @@ class ChunkingStrategy:
         Returns:
             List of text chunks
         """
-        try:
-            import nltk
-            nltk.download('punkt', quiet=True)
-            from nltk.tokenize import sent_tokenize
-        except ImportError:
-            logger.warning("nltk not available, using period-based sentence splitting")
+        sent_tokenize = _get_sent_tokenize()
+        if sent_tokenize is None:
             sentences = text.split('. ')
         else:
             sentences = sent_tokenize(text)
         
-        chunks = []
-        start = 0
-        
-        while start < len(sentences):
-            end = min(start + sentences_per_chunk, len(sentences))
-            chunk_sentences = sentences[start:end]
-            chunk = '. '.join(chunk_sentences)
-            
-            if len(chunk) > DocumentProcessor.MIN_CHUNK_SIZE:
-                chunks.append(chunk)
-            
-            start += sentences_per_chunk - overlap_sentences
+        min_size = DocumentProcessor.MIN_CHUNK_SIZE
+        step = sentences_per_chunk - overlap_sentences
         
-        return chunks
+        # Join each window once and test the joined string in the same pass
+        return [
+            chunk
+            for start in range(0, len(sentences), step)
+            if len(chunk := '. '.join(sentences[start:start + sentences_per_chunk])) > min_size
+        ]
     
     @staticmethod
     def chunk_by_paragraphs(text: str) -> List[str]:
@@ -347,31 +600,18 @@ class ChunkingStrategy:
         Returns:
             List of paragraphs as chunks
         """
-        chunks = [p.strip() for p in text.split('\n\n') if p.strip()]
-        return [c for c in chunks if len(c) > DocumentProcessor.MIN_CHUNK_SIZE]
+        min_size = DocumentProcessor.MIN_CHUNK_SIZE
+        return [
+            chunk
+            for p in _PARA_SPLIT.split(text)
+            if len(chunk := p.strip()) > min_size
+        ]
 
 
 class TokenCounter:
     """Token counting utilities"""
     
-    @staticmethod
-    def count_tokens(text: str) -> int:
-        """
-        Count approximate tokens in text
-        
-        Args:
-            text: Text to count
-            
-        Returns:
-            Estimated token count
-        """
-        try:
-            import tiktoken
-            encoding = tiktoken.get_encoding("cl100k_base")
-            return len(encoding.encode(text))
-        except ImportError:
-            logger.warning("tiktoken not available, using character-based estimation")
-            return len(text) // 4
+    count_tokens = staticmethod(count_tokens)
     
     @staticmethod
     def count_words(text: str) -> int:
@@ -1,11 +1,51 @@
 """LLM provider wrappers for OpenAI and Cohere"""
 
+import asyncio
 import logging
 from typing import List, Optional, Dict, Any
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
 
+_RAG_PROMPT = """Based on the following context, answer the user's question.
+        
+Context:
+{ctx}
+
+Question: {q}
+
+Answer:"""
+
+
+def _build_rag_prompt(query: str, context: List[str]) -> str:
+    """Build the RAG prompt from the query and the top 5 context documents"""
+    context_str = "\n\n".join(
+        f"Document {i+1}:\n{doc}" for i, doc in enumerate(context[:5])
+    )
+    return _RAG_PROMPT.format(ctx=context_str, q=query)
+
+
+def _build_http_client():
+    """
+    Build the pooled async HTTP client used by API-backed providers
+    
+    Concurrent requests share keep-alive connections, multiplexed over
+    HTTP/2 when the h2 package is installed.
+    """
+    import httpx
+    
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        http2=http2
+    )
+
 
 class BaseLLMProvider(ABC):
     """Base class for LLM providers"""
@@ -62,6 +102,35 @@ class BaseLLMProvider(ABC):
             Generated response with context
         """
         pass
+    
+    async def aclose(self):
+        """Release network resources held by the provider"""
+        pass
+    
+    async def generate_batch(
+        self,
+        prompts: List[str],
+        concurrency: int = 8,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate text for several prompts concurrently
+        
+        Args:
+            prompts: Input prompts
+            concurrency: Maximum number of in-flight requests
+            **kwargs: Generation arguments passed to generate()
+            
+        Returns:
+            Generated texts, in prompt order
+        """
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def _generate(prompt: str) -> str:
+            async with sem:
+                return await self.generate(prompt, **kwargs)
+        
+        return await asyncio.gather(*(_generate(prompt) for prompt in prompts))
 
 
 class OpenAIProvider(BaseLLMProvider):
@@ -82,10 +151,18 @@ class OpenAIProvider(BaseLLMProvider):
         
         try:
             from openai import AsyncOpenAI
-            self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+            self.client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=_build_http_client()
+            )
         except ImportError:
             raise ImportError("openai package not installed. Install: pip install openai")
     
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        await self.client.close()
+    
     async def generate(
         self,
         prompt: str,
@@ -147,20 +224,7 @@ class OpenAIProvider(BaseLLMProvider):
         Returns:
             Generated response
         """
-        # Build context string
-        context_str = "\n\n".join(
-            [f"Document {i+1}:\n{doc}" for i, doc in enumerate(context[:5])]
-        )
-        
-        prompt = f"""Based on the following context, answer the user's question.
-        
-Context:
-{context_str}
-
-Question: {query}
-
-Answer:"""
-        
+        prompt = _build_rag_prompt(query, context)
         return await self.generate(prompt, max_tokens, temperature, **kwargs)
 
 
@@ -242,20 +306,7 @@ class CohereProvider(BaseLLMProvider):
         Returns:
             Generated response
         """
-        # Build context string
-        context_str = "\n\n".join(
-            [f"Document {i+1}:\n{doc}" for i, doc in enumerate(context[:5])]
-        )
-        
-        prompt = f"""Based on the following context, answer the user's question.
-        
-Context:
-{context_str}
-
-Question: {query}
-
-Answer:"""
-        
+        prompt = _build_rag_prompt(query, context)
         return await self.generate(prompt, max_tokens, temperature, **kwargs)
 
 
@@ -1,7 +1,7 @@
 
 import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 from sqlalchemy import select
 import os
 
@@ -10,17 +10,21 @@ from models.user import User
 
 async def check_users():
     DATABASE_URL = os.getenv("DATABASE_URL")
-    engine = create_async_engine(DATABASE_URL)
-    AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    # Single query then exit: no pool, connections close as soon as they are released
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+    AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
     
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(select(User).where(User.username == 'admin'))
-        user = result.scalar_one_or_none()
-        
-        if not user:
-            print("USER_NOT_FOUND")
-        else:
-            print(f"USER_FOUND: {user.username}, Active: {user.is_active}")
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(User).where(User.username == 'admin'))
+            user = result.scalar_one_or_none()
+            
+            if not user:
+                print("USER_NOT_FOUND")
+            else:
+                print(f"USER_FOUND: {user.username}, Active: {user.is_active}")
+    finally:
+        await engine.dispose()
 
 if __name__ == "__main__":
     asyncio.run(check_users())
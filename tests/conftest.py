@@ -1,6 +1,11 @@
 """Pytest configuration and shared fixtures"""
 
+import hashlib
+from contextlib import contextmanager
+import json
+import jwt
 import pytest
+from jwt.utils import base64url_encode
 import sys
 import os
 from pathlib import Path
@@ -10,16 +15,40 @@ import asyncio
 os.environ["JWT_SECRET_KEY"] = "test-secret-key"
 os.environ["ENCRYPTION_KEY"] = "test-encryption-key"
 os.environ["TESTING"] = "true"
+os.environ["PW_TIME_COST"] = "1"
+os.environ["PW_MEMORY_COST"] = "8"
+os.environ["PW_PARALLELISM"] = "1"
 
-# Add src to path
+# Add src to path once for every test module
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.pool import StaticPool
 from helpers.database import Base
-from main import app
+from helpers.limiter import limiter
 from models.user import User, UserRole
-from helpers.password import hash_password
+from helpers import password as password_helpers
+from helpers.config import Settings, get_settings
+from helpers.jwt_handler import create_access_token
+
+
+FAST_HASH_PREFIX = "sha256$"
+
+
+def _fast_hash_password(password: str) -> str:
+    """SHA-256 stand-in for the argon2id KDF, for test mode only"""
+    return FAST_HASH_PREFIX + hashlib.sha256(password.encode()).hexdigest()
+
+
+def _fast_verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a _fast_hash_password() hash"""
+    return hashed_password == _fast_hash_password(plain_password)
+
+
+def _fast_needs_rehash(hashed_password: str) -> bool:
+    """Flag any hash not made by _fast_hash_password() for rehashing"""
+    return not hashed_password.startswith(FAST_HASH_PREFIX)
 
 
 # Test database URL - using SQLite in-memory for tests
@@ -29,16 +58,95 @@ test_engine = None
 
 @pytest.fixture(scope="session")
 def event_loop():
-    """Create event loop for async tests"""
+    """Create one event loop shared by every async test and fixture
+    
+    Overriding event_loop at session scope is how pytest-asyncio 0.23 sets
+    the loop scope; asyncio_default_test_loop_scope only exists from 0.24.
+    """
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     yield loop
     loop.close()
 
 
+@pytest.fixture(scope="session")
+def app():
+    """FastAPI app, imported on first use so tests that never need it skip loading it"""
+    from main import app as fastapi_app
+    from fastapi.testclient import TestClient
+    
+    # Warm routing, middleware and response serialization once so the first
+    # test doesn't pay for it; no lifespan, as startup dials the real database
+    client = TestClient(fastapi_app)
+    for path in ("/api/v1/health", "/api/v1/", "/api/v1/auth/csrf"):
+        client.get(path)
+    
+    return fastapi_app
+
+
+@pytest.fixture(scope="session")
+def base_settings():
+    """Settings parsed from the test environment once per session
+    
+    Treat it as read-only; tests that need different values take
+    base_settings.model_copy(update={...}).
+    """
+    return Settings()
+
+
+@pytest.fixture(scope="session")
+def make_token(base_settings):
+    """Token signer for tests that only need a well-formed token for verify_token
+    
+    The header segment and signing key are prepared once, so each call only
+    encodes the claims and signs; tests of create_access_token itself keep
+    calling it directly.
+    """
+    algorithm = jwt.get_algorithm_by_name(base_settings.JWT_ALGORITHM)
+    signing_key = algorithm.prepare_key(base_settings.JWT_SECRET_KEY)
+    header_segment = base64url_encode(
+        json.dumps({"alg": base_settings.JWT_ALGORITHM, "typ": "JWT"}, separators=(",", ":")).encode()
+    )
+    
+    def _make_token(data: dict) -> str:
+        payload_segment = base64url_encode(json.dumps(data, separators=(",", ":")).encode())
+        signing_input = header_segment + b"." + payload_segment
+        signature = base64url_encode(algorithm.sign(signing_input, signing_key))
+        return (signing_input + b"." + signature).decode()
+    
+    return _make_token
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """Swap the password KDF for a SHA-256 stub for the whole session
+    
+    Patches the helpers.password functions and the names UserController
+    imported from it. pwd_context and names bound before the session starts
+    (e.g. in tests/unit/test_password.py) keep the real KDF.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        for module in ("helpers.password", "controllers.UserController"):
+            mp.setattr(f"{module}.hash_password", _fast_hash_password)
+            mp.setattr(f"{module}.verify_password", _fast_verify_password)
+            mp.setattr(f"{module}.needs_rehash", _fast_needs_rehash)
+        yield
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Start every test with empty rate-limit buckets instead of waiting out the window"""
+    limiter.reset()
+    yield
+
+
 @pytest.fixture(scope="session")
 async def init_test_db(event_loop):
-    """Initialize test database - runs once per session"""
+    """Initialize test database - runs once per session
+    
+    The in-memory database lives in this process, so every pytest-xdist
+    worker gets its own isolated copy.
+    """
     global test_engine
     
     test_engine = create_async_engine(
@@ -48,24 +156,84 @@ async def init_test_db(event_loop):
         echo=False,
     )
     
+    # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs nest inside the
+    # per-test outer transaction instead of committing it on release
+    @event.listens_for(test_engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(test_engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
     yield test_engine
     
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-    
+    # Per-test state is reset by db_connection's rollback; the in-memory
+    # database itself goes away with its only connection, so no drop_all
     await test_engine.dispose()
 
 
 @pytest.fixture
 async def db_session(init_test_db):
     """Create database session for tests"""
-    async with AsyncSession(init_test_db) as session:
+    async with AsyncSession(init_test_db, expire_on_commit=False) as session:
         yield session
 
 
+@pytest.fixture
+async def db_connection(init_test_db):
+    """Shared-engine connection whose outer transaction is rolled back after each test
+    
+    Bind sessions with join_transaction_mode="create_savepoint" so their
+    commits only release a SAVEPOINT inside this transaction.
+    """
+    async with init_test_db.connect() as conn:
+        trans = await conn.begin()
+        yield conn
+        await trans.rollback()
+
+
+@pytest.fixture(scope="session")
+async def asgi_client(event_loop, app):
+    """In-process ASGI client shared by every E2E test
+    
+    Fixtures that use it set their own get_db override and clear cookies
+    on teardown so login cookies never leak between tests.
+    """
+    from httpx import ASGITransport, AsyncClient
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def get_db_override(app):
+    """Context-manager factory installing a get_db override on the app
+    
+    On exit it restores whatever override was installed before instead of
+    clearing them all, so session-scoped clients (seeded_client) keep their
+    override across tests that install their own.
+    """
+    from helpers.database import get_db
+    
+    @contextmanager
+    def _override(override_get_db):
+        previous = app.dependency_overrides.get(get_db)
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            yield
+        finally:
+            if previous is None:
+                app.dependency_overrides.pop(get_db, None)
+            else:
+                app.dependency_overrides[get_db] = previous
+    
+    return _override
+
+
 @pytest.fixture
 def anyio_backend():
     """Configure anyio backend for async tests"""
@@ -73,34 +241,29 @@ def anyio_backend():
 
 
 @pytest.fixture
-def csrf_client(init_test_db):
+def csrf_client(init_test_db, app, get_db_override):
     """Create test client with database override (CSRF middleware is bypassed in test mode)"""
     from fastapi.testclient import TestClient
     
     async def override_get_db():
-        async with AsyncSession(init_test_db) as session:
+        async with AsyncSession(init_test_db, expire_on_commit=False) as session:
             yield session
     
-    from helpers.database import get_db
-    app.dependency_overrides[get_db] = override_get_db
-    
-    client = TestClient(app)
-    yield client
-    
-    app.dependency_overrides.clear()
+    with get_db_override(override_get_db):
+        yield TestClient(app)
 
 
-@pytest.fixture
-async def seeded_client(init_test_db):
-    """Create test client with seeded data (admin user)"""
-    async with AsyncSession(init_test_db) as session:
+@pytest.fixture(scope="session")
+async def seeded_db(init_test_db):
+    """Seed the test database with the admin user - runs once per session"""
+    async with AsyncSession(init_test_db, expire_on_commit=False) as session:
         # Check if user already exists
         from sqlalchemy import select
         result = await session.execute(select(User).where(User.username == "admin"))
         existing_user = result.scalar()
         
         if not existing_user:
-            hashed_password = hash_password("password")
+            hashed_password = password_helpers.hash_password("password")
             user = User(
                 username="admin",
                 email="admin@test.com",
@@ -112,20 +275,110 @@ async def seeded_client(init_test_db):
             session.add(user)
             await session.commit()
     
-    # Create the client
+    return init_test_db
+
+
+@pytest.fixture(scope="session")
+def seeded_bind(seeded_db):
+    """Bind target for seeded_client's sessions
+    
+    Points at the seeded engine by default; seeded_transaction swaps in a
+    per-test connection so that test's writes are rolled back.
+    """
+    return {"bind": seeded_db}
+
+
+@pytest.fixture(scope="session")
+def seeded_client(seeded_db, seeded_bind, app, get_db_override):
+    """Create test client with seeded data (admin user) - built once per session
+    
+    The admin user is seeded once; tests that also request seeded_transaction
+    get their writes (e.g. last_login on each login) rolled back afterwards.
+    """
     async def override_get_db():
-        async with AsyncSession(init_test_db) as session:
+        async with AsyncSession(
+            bind=seeded_bind["bind"],
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False
+        ) as session:
             yield session
     
-    from helpers.database import get_db
-    app.dependency_overrides[get_db] = override_get_db
-    
     from fastapi.testclient import TestClient
-    client = TestClient(app)
     
-    yield client
+    with get_db_override(override_get_db):
+        yield TestClient(app)
+
+
+@pytest.fixture
+def seeded_transaction(seeded_db, seeded_bind, db_connection):
+    """Route seeded_client's sessions through db_connection for one test
     
-    app.dependency_overrides.clear()
+    Commits inside the app only release a SAVEPOINT, and db_connection rolls
+    the whole transaction back at teardown, restoring the seeded snapshot.
+    """
+    seeded_bind["bind"] = db_connection
+    yield db_connection
+    seeded_bind["bind"] = seeded_db
+
+
+@pytest.fixture(scope="session")
+async def e2e_seeded_db(init_test_db):
+    """Seed the shared test database with the E2E user - runs once per session"""
+    async with AsyncSession(init_test_db, expire_on_commit=False) as session:
+        result = await session.execute(select(User).where(User.username == "testuser"))
+        if not result.scalar():
+            session.add(User(
+                username="testuser",
+                email="testuser@example.com",
+                hashed_password=password_helpers.hash_password("password123"),
+                role=UserRole.USER,
+                is_active=True,
+                is_verified=True
+            ))
+            await session.commit()
+    
+    return init_test_db
+
+
+@pytest.fixture(scope="session")
+async def auth_token(e2e_seeded_db):
+    """JWT for the seeded E2E user, minted directly instead of via /auth/login"""
+    async with AsyncSession(e2e_seeded_db, expire_on_commit=False) as session:
+        user_id = await session.scalar(select(User.id).where(User.username == "testuser"))
+    
+    return create_access_token(
+        data={"sub": "testuser", "user_id": user_id, "role": UserRole.USER.value},
+        settings=get_settings()
+    )
+
+
+@pytest.fixture
+def auth_headers(auth_token):
+    """Bearer authorization header for the seeded E2E user"""
+    return {"Authorization": f"Bearer {auth_token}"}
+
+
+@pytest.fixture
+async def e2e_client(db_connection, asgi_client, get_db_override):
+    """Shared in-process ASGI client whose writes are rolled back after the test"""
+    async def override_get_db():
+        async with AsyncSession(
+            bind=db_connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False
+        ) as session:
+            yield session
+    
+    with get_db_override(override_get_db):
+        yield asgi_client
+    
+    asgi_client.cookies.clear()
+
+
+@pytest.fixture
+def seeded_db_client(e2e_seeded_db, e2e_client):
+    """E2E client plus the engine holding the seeded E2E user"""
+    yield e2e_client, e2e_seeded_db
 
 
 # Marker for different test types
@@ -0,0 +1,200 @@
+"""Unit tests for the Celery task helpers"""
+
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+from helpers.exceptions import ResourceNotFoundException
+from tasks import celery_tasks
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.Redis calls the task helpers make"""
+    
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+    
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = str(value).encode()
+        self.ttls[key] = ex
+        return True
+    
+    def expire(self, key, seconds):
+        if key not in self.store:
+            return False
+        self.ttls[key] = seconds
+        return True
+    
+    def get(self, key):
+        return self.store.get(key)
+    
+    def exists(self, key):
+        return int(key in self.store)
+    
+    def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Point the task helpers at a fresh FakeRedis"""
+    client = FakeRedis()
+    monkeypatch.setattr(celery_tasks, "_REDIS", client)
+    return client
+
+
+@pytest.mark.unit
+class TestIdempotencyKeys:
+    """Tests for _claim, _release and the stage markers"""
+    
+    def test_claim_is_exclusive_until_released(self, fake_redis):
+        """Test that a second task can't claim a held key until it is released"""
+        assert celery_tasks._claim("rag:1:2", "task-a")
+        assert not celery_tasks._claim("rag:1:2", "task-b")
+        
+        celery_tasks._release("rag:1:2")
+        
+        assert celery_tasks._claim("rag:1:2", "task-b")
+    
+    def test_claim_is_kept_by_retries_of_the_same_task(self, fake_redis):
+        """Test that a redelivered task keeps its own claim"""
+        assert celery_tasks._claim("rag:1:pipeline", "task-a")
+        assert celery_tasks._claim("rag:1:pipeline", "task-a")
+    
+    def test_claim_retry_restarts_ttl(self, fake_redis):
+        """Test that re-claiming a held key restarts its expiry"""
+        celery_tasks._claim("rag:1:pipeline", "task-a")
+        fake_redis.ttls["rag:1:pipeline"] = 5
+        
+        assert celery_tasks._claim("rag:1:pipeline", "task-a")
+        assert fake_redis.ttls["rag:1:pipeline"] == celery_tasks.MARKER_TTL_SECONDS
+    
+    def test_claim_granted_when_redis_unavailable(self, monkeypatch):
+        """Test that tasks still run when Redis can't be reached"""
+        broken = MagicMock()
+        broken.set.side_effect = ConnectionError("redis down")
+        monkeypatch.setattr(celery_tasks, "_REDIS", broken)
+        
+        assert celery_tasks._claim("rag:1:2", "task-a")
+    
+    def test_stage_markers(self, fake_redis):
+        """Test marking, checking and releasing a pipeline stage"""
+        assert not celery_tasks._stage_done("rag:1:processed")
+        
+        celery_tasks._mark_stage_done("rag:1:processed")
+        assert celery_tasks._stage_done("rag:1:processed")
+        
+        celery_tasks._release("rag:1:pipeline", "rag:1:processed")
+        assert not celery_tasks._stage_done("rag:1:processed")
+
+
+@pytest.mark.unit
+class TestTerminalFailure:
+    """Tests that tasks free their keys once retries run out"""
+    
+    @pytest.fixture
+    def failing_session(self, monkeypatch, event_loop):
+        """Make every database session the tasks open fail
+        
+        The tasks' asyncio.run() unsets the current loop on exit, so the
+        shared session loop is put back afterwards.
+        """
+        def _fail():
+            raise ConnectionError("database down")
+        monkeypatch.setattr(celery_tasks, "_get_async_session", _fail)
+        yield
+        asyncio.set_event_loop(event_loop)
+    
+    def test_process_asset_releases_claim(self, fake_redis, failing_session):
+        """Test that the asset can be resubmitted after the last retry fails"""
+        task = celery_tasks.process_asset_task
+        result = task.apply(args=(1, 2), task_id="task-a", retries=task.max_retries)
+        
+        assert result.failed()
+        assert "rag:1:2" not in fake_redis.store
+        assert celery_tasks._claim("rag:1:2", "task-b")
+    
+    def test_pipeline_releases_claim_and_stage_markers(self, fake_redis, failing_session):
+        """Test that a new pipeline run doesn't skip stages of a failed one"""
+        celery_tasks._mark_stage_done("rag:1:processed")
+        task = celery_tasks.full_rag_pipeline_task
+        
+        result = task.apply(args=(1,), task_id="task-a", retries=task.max_retries)
+        
+        assert result.failed()
+        assert fake_redis.store == {}
+
+
+@pytest.mark.unit
+class TestBatchProcessAssets:
+    """Tests for dispatching the batch-processing chord"""
+    
+    def test_unknown_project_raises_before_dispatch(self, monkeypatch, event_loop):
+        """Test that a missing project fails the task instead of dispatching nothing"""
+        @asynccontextmanager
+        async def session():
+            yield AsyncMock()
+        
+        repository = MagicMock()
+        repository.return_value.get_project = AsyncMock(return_value=None)
+        chord = MagicMock()
+        monkeypatch.setattr(celery_tasks, "_get_async_session", session)
+        monkeypatch.setattr(celery_tasks, "ProjectRepository", repository)
+        monkeypatch.setattr(celery_tasks, "chord", chord)
+        
+        result = celery_tasks.batch_process_assets_task.apply(args=(404,))
+        asyncio.set_event_loop(event_loop)
+        
+        # Celery rebuilds the stored exception, which loses the subclass
+        assert result.failed()
+        assert str(result.result) == str(ResourceNotFoundException("Project", 404))
+        chord.assert_not_called()
+        # Not retried: the lookup ran once
+        repository.return_value.get_project.assert_awaited_once()
+
+
+@pytest.mark.unit
+class TestAggregateResults:
+    """Tests for the batch-processing chord callback"""
+    
+    RESULTS = [
+        {"status": "success", "asset_id": 1, "chunks_created": 3},
+        {"status": "failed", "asset_id": 2, "error": "boom"},
+        {"status": "success", "asset_id": 3, "chunks_created": 4},
+    ]
+    
+    @pytest.fixture
+    def vectorize_delay(self, monkeypatch):
+        """Capture vectorization requests instead of queueing them"""
+        delay = MagicMock()
+        monkeypatch.setattr(celery_tasks.vectorize_chunks_task, "delay", delay)
+        return delay
+    
+    def test_aggregate_results_sums_successes(self, vectorize_delay):
+        """Test totals, failure count and chunk sum over the header results"""
+        summary = celery_tasks._aggregate_results(self.RESULTS, 7)
+        
+        assert summary["project_id"] == 7
+        assert summary["total_assets"] == 3
+        assert summary["processed_assets"] == 2
+        assert summary["failed_assets"] == 1
+        assert summary["chunks_created"] == 7
+        assert [r["asset_id"] for r in summary["results"]] == [1, 3]
+        vectorize_delay.assert_not_called()
+    
+    def test_aggregate_results_queues_vectorization(self, vectorize_delay):
+        """Test that vectorization is queued once when requested"""
+        celery_tasks._aggregate_results(self.RESULTS, 7, vectorize=True)
+        
+        vectorize_delay.assert_called_once_with(7)
+    
+    def test_aggregate_results_skips_vectorization_when_nothing_processed(self, vectorize_delay):
+        """Test that an all-failed batch doesn't queue vectorization"""
+        summary = celery_tasks._aggregate_results([self.RESULTS[1]], 7, vectorize=True)
+        
+        assert summary["processed_assets"] == 0
+        vectorize_delay.assert_not_called()
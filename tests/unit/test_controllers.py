@@ -1,30 +1,121 @@
 """Unit tests for controllers"""
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+from unittest.mock import AsyncMock, MagicMock, create_autospec, patch
 from sqlalchemy.ext.asyncio import AsyncSession
 
-# We need to add the src directory to path for imports
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
-
+from controllers.ProcessingController import ProcessingController
 from controllers.ProjectController import ProjectController
+from controllers.UserController import UserController
 from helpers.exceptions import (
     ResourceNotFoundException,
     ValidationException,
     DatabaseException,
 )
+from helpers.password import pwd_context
+from models.db_models import Chunk
 from schemas import ProjectCreateRequest, ProjectUpdateRequest
+from utils import document_processor
+
+
+# Spec'ing a mock introspects all of AsyncSession, so build one per module
+# and reset it for each use
+_ASYNC_SESSION = create_autospec(AsyncSession, instance=True)
+
+
+def _mock_session() -> AsyncSession:
+    """The module's AsyncSession mock with return values and call history reset"""
+    _ASYNC_SESSION.reset_mock(return_value=True, side_effect=True)
+    return _ASYNC_SESSION
+
+
+# Shared stand-in for a Project row; cases derive variants from it
+_PROJECT = SimpleNamespace(
+    id=1,
+    name="Test Project",
+    description="Test Description",
+    status="active",
+    created_at=datetime(2024, 1, 15, 10, 30),
+    updated_at=datetime(2024, 1, 15, 10, 30)
+)
+
+
+@dataclass(frozen=True)
+class CrudCase:
+    """One ProjectController happy-path call and its expectations
+    
+    Attributes:
+        method: Controller method, also the repository method asserted on
+        args: Positional arguments for the controller method
+        kwargs: Keyword arguments for the controller method
+        repo_returns: Repository method name -> return value
+        check: Predicate the controller's result must satisfy
+        called_with: (args, kwargs) the repository method must be called
+                     with, or None to only assert a single call
+    """
+    method: str
+    args: tuple
+    repo_returns: dict
+    check: Callable[[Any], bool]
+    kwargs: dict = field(default_factory=dict)
+    called_with: Optional[tuple] = None
+
+
+CRUD_CASES = [
+    CrudCase(
+        method="create_project",
+        args=(ProjectCreateRequest(name="Test Project", description="Test Description"),),
+        repo_returns={"create_project": _PROJECT},
+        check=lambda result: result.name == "Test Project",
+    ),
+    CrudCase(
+        method="get_project",
+        args=(1,),
+        repo_returns={"get_project": _PROJECT},
+        check=lambda result: result.name == "Test Project",
+        called_with=((1,), {}),
+    ),
+    CrudCase(
+        method="list_projects",
+        args=(),
+        kwargs={"skip": 0, "limit": 10},
+        repo_returns={"list_projects": (
+            [SimpleNamespace(**{**vars(_PROJECT), "id": i, "name": f"Project {i}"}) for i in (1, 2)],
+            2
+        )},
+        check=lambda result: len(result[0]) == 2 and result[1] == 2,
+        called_with=((), {"skip": 0, "limit": 10}),
+    ),
+    CrudCase(
+        method="update_project",
+        args=(1, ProjectUpdateRequest(name="Updated Name")),
+        repo_returns={
+            "get_project": _PROJECT,
+            "update_project": SimpleNamespace(**{**vars(_PROJECT), "name": "Updated Name"}),
+        },
+        check=lambda result: result.name == "Updated Name",
+    ),
+    CrudCase(
+        method="delete_project",
+        args=(1,),
+        repo_returns={"get_project": _PROJECT, "delete_project": True},
+        check=lambda result: result is True,
+        called_with=((1,), {}),
+    ),
+]
 
 
 class TestProjectController:
     """Test suite for ProjectController"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mock_db(self):
-        """Create mock database session"""
-        return AsyncMock(spec=AsyncSession)
+        """Create mock database session shared by the class's tests"""
+        return _mock_session()
     
     @pytest.fixture
     def mock_repo(self):
@@ -32,34 +123,39 @@ class TestProjectController:
         repo = AsyncMock()
         return repo
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def controller(self, mock_db):
-        """Create controller instance with mocked dependencies"""
+        """Create controller instance with mocked dependencies, once per class"""
         with patch('controllers.ProjectController.ProjectRepository'):
             controller = ProjectController(mock_db)
             controller.repo = AsyncMock()
             return controller
     
-    @pytest.mark.asyncio
-    async def test_create_project_success(self, controller):
-        """Test successful project creation"""
+    @pytest.fixture(autouse=True)
+    def reset_repo(self, controller):
+        """Clear repository return values and calls left by the previous test"""
+        yield
+        controller.repo.reset_mock(return_value=True, side_effect=True)
+    
+    @pytest.mark.parametrize("case", CRUD_CASES, ids=lambda case: case.method)
+    async def test_crud_happy_path(self, controller, case):
+        """Test successful create/get/list/update/delete"""
         # Arrange
-        req = ProjectCreateRequest(name="Test Project", description="Test Description")
-        mock_project = MagicMock()
-        mock_project.id = 1
-        mock_project.name = "Test Project"
-        mock_project.description = "Test Description"
-        mock_project.status = "active"
-        controller.repo.create_project.return_value = mock_project
+        for repo_method, value in case.repo_returns.items():
+            getattr(controller.repo, repo_method).return_value = value
         
         # Act
-        result = await controller.create_project(req)
+        result = await getattr(controller, case.method)(*case.args, **case.kwargs)
         
         # Assert
-        assert result.name == "Test Project"
-        controller.repo.create_project.assert_called_once()
+        assert case.check(result)
+        repo_method = getattr(controller.repo, case.method)
+        if case.called_with is None:
+            repo_method.assert_called_once()
+        else:
+            args, kwargs = case.called_with
+            repo_method.assert_called_once_with(*args, **kwargs)
     
-    @pytest.mark.asyncio
     async def test_create_project_empty_name(self, controller):
         """Test project creation with empty name - validation at Pydantic level"""
         # Arrange & Act & Assert
@@ -68,25 +164,6 @@ class TestProjectController:
         with pytest.raises(ValidationError):
             req = ProjectCreateRequest(name="", description="Test")
     
-    @pytest.mark.asyncio
-    async def test_get_project_success(self, controller):
-        """Test successful project retrieval"""
-        # Arrange
-        mock_project = MagicMock()
-        mock_project.id = 1
-        mock_project.name = "Test Project"
-        mock_project.description = "Test Description"
-        mock_project.status = "active"
-        controller.repo.get_project.return_value = mock_project
-        
-        # Act
-        result = await controller.get_project(1)
-        
-        # Assert
-        assert result.name == "Test Project"
-        controller.repo.get_project.assert_called_once_with(1)
-    
-    @pytest.mark.asyncio
     async def test_get_project_not_found(self, controller):
         """Test project retrieval when project doesn't exist"""
         # Arrange
@@ -96,54 +173,6 @@ class TestProjectController:
         with pytest.raises(ResourceNotFoundException):
             await controller.get_project(999)
     
-    @pytest.mark.asyncio
-    async def test_list_projects_success(self, controller):
-        """Test successful project listing"""
-        # Arrange
-        mock_project_1 = MagicMock()
-        mock_project_1.id = 1
-        mock_project_1.name = "Project 1"
-        mock_project_1.description = "Desc 1"
-        mock_project_1.status = "active"
-        
-        mock_project_2 = MagicMock()
-        mock_project_2.id = 2
-        mock_project_2.name = "Project 2"
-        mock_project_2.description = "Desc 2"
-        mock_project_2.status = "active"
-        
-        mock_projects = [mock_project_1, mock_project_2]
-        controller.repo.list_projects.return_value = (mock_projects, 2)
-        
-        # Act
-        results, total = await controller.list_projects(skip=0, limit=10)
-        
-        # Assert
-        assert len(results) == 2
-        assert total == 2
-        controller.repo.list_projects.assert_called_once_with(skip=0, limit=10)
-    
-    @pytest.mark.asyncio
-    async def test_update_project_success(self, controller):
-        """Test successful project update"""
-        # Arrange
-        req = ProjectUpdateRequest(name="Updated Name")
-        mock_project = MagicMock()
-        mock_project.id = 1
-        mock_project.name = "Updated Name"
-        mock_project.description = "Original Description"
-        mock_project.status = "active"
-        controller.repo.get_project.return_value = mock_project
-        controller.repo.update_project.return_value = mock_project
-        
-        # Act
-        result = await controller.update_project(1, req)
-        
-        # Assert
-        assert result.name == "Updated Name"
-        controller.repo.update_project.assert_called_once()
-    
-    @pytest.mark.asyncio
     async def test_update_project_not_found(self, controller):
         """Test update of non-existent project"""
         # Arrange
@@ -154,22 +183,6 @@ class TestProjectController:
         with pytest.raises(ResourceNotFoundException):
             await controller.update_project(999, req)
     
-    @pytest.mark.asyncio
-    async def test_delete_project_success(self, controller):
-        """Test successful project deletion"""
-        # Arrange
-        mock_project = MagicMock()
-        controller.repo.get_project.return_value = mock_project
-        controller.repo.delete_project.return_value = True
-        
-        # Act
-        result = await controller.delete_project(1)
-        
-        # Assert
-        assert result is True
-        controller.repo.delete_project.assert_called_once_with(1)
-    
-    @pytest.mark.asyncio
     async def test_delete_project_not_found(self, controller):
         """Test deletion of non-existent project"""
         # Arrange
@@ -177,4 +190,109 @@ class TestProjectController:
         
         # Act & Assert
         with pytest.raises(ResourceNotFoundException):
-            await controller.delete_project(999)
\ No newline at end of file
+            await controller.delete_project(999)
+
+
+class FakeEncoding:
+    """One token per character, counting how often text gets encoded"""
+    
+    def __init__(self):
+        self.encode_calls = 0
+    
+    def encode(self, text):
+        self.encode_calls += 1
+        return [ord(c) for c in text]
+    
+    def decode(self, tokens):
+        return "".join(map(chr, tokens))
+    
+    def decode_batch(self, batch):
+        return [self.decode(tokens) for tokens in batch]
+
+
+class TestProcessingController:
+    """Test suite for ProcessingController"""
+    
+    @pytest.fixture
+    def encoding(self, monkeypatch):
+        """Route tokenization through a FakeEncoding with empty token caches"""
+        fake = FakeEncoding()
+        monkeypatch.setattr(document_processor, "_get_encoding", lambda name="cl100k_base": fake)
+        document_processor.clear_token_caches()
+        yield fake
+        document_processor.clear_token_caches()
+    
+    @pytest.fixture
+    def controller(self, tmp_path):
+        """Controller whose asset points at a small text file on disk"""
+        file_path = tmp_path / "doc.txt"
+        file_path.write_text("word " * 200)
+        asset = SimpleNamespace(id=2, filename="doc.txt", file_path=str(file_path), is_processed=False)
+        
+        db = _mock_session()
+        db.execute.return_value = MagicMock(**{"scalars.return_value.first.return_value": asset})
+        with patch('controllers.ProcessingController.ProjectRepository'):
+            controller = ProcessingController(db)
+        controller.repo = AsyncMock()
+        controller.repo.get_project.return_value = _PROJECT
+        return controller
+    
+    async def test_token_strategy_encodes_once(self, controller, encoding):
+        """Test that token chunking reuses one encode for the chunk token counts"""
+        with patch('controllers.ProcessingController.TokenCounter.count_tokens') as count_tokens:
+            result = await controller.process_asset(1, 2, chunk_size=300, chunk_overlap=50, strategy="tokens")
+        
+        count_tokens.assert_not_called()
+        assert encoding.encode_calls == 1
+        
+        chunks = [c.args[0] for c in controller.db.add.call_args_list if isinstance(c.args[0], Chunk)]
+        assert [chunk.token_count for chunk in chunks] == [300, 300, 300, 249]
+        assert [len(chunk.content) for chunk in chunks] == [300, 300, 300, 249]
+        assert result["chunks_created"] == 4
+        assert result["total_tokens"] == 1149
+    
+    async def test_token_counts_cleared_after_asset(self, controller, encoding):
+        """Test that per-chunk token counts aren't kept once the asset is stored"""
+        result = await controller.process_asset(1, 2, chunk_size=300, chunk_overlap=50, strategy="size")
+        
+        assert result["total_tokens"] == 1149
+        assert document_processor.count_tokens.cache_info().currsize == 0
+
+
+class TestUserController:
+    """Test suite for UserController"""
+    
+    @pytest.fixture
+    def real_kdf(self, monkeypatch):
+        """Use the real password KDF instead of the session-wide SHA-256 stub"""
+        monkeypatch.setattr("controllers.UserController.hash_password", pwd_context.hash)
+        monkeypatch.setattr("controllers.UserController.verify_password", pwd_context.verify)
+        monkeypatch.setattr("controllers.UserController.needs_rehash", pwd_context.needs_update)
+    
+    @staticmethod
+    async def _login(hashed_password):
+        """Authenticate against a user with the given hash; return the UPDATE values"""
+        user = SimpleNamespace(id=7, username="admin", is_active=True, hashed_password=hashed_password)
+        db = _mock_session()
+        db.execute.return_value = MagicMock(**{"scalar.return_value": user})
+        
+        assert await UserController.authenticate_user(db, "admin", "password123") is user
+        
+        update_stmt = db.execute.await_args_list[-1].args[0]
+        return update_stmt.compile().params
+    
+    async def test_login_upgrades_legacy_bcrypt_hash(self, real_kdf):
+        """Test that a bcrypt hash is replaced by argon2id on successful login"""
+        from passlib.hash import bcrypt
+        
+        values = await self._login(bcrypt.using(rounds=4).hash("password123"))
+        
+        assert values["hashed_password"].startswith("$argon2id$")
+        assert pwd_context.verify("password123", values["hashed_password"])
+    
+    async def test_login_keeps_current_hash(self, real_kdf):
+        """Test that an up-to-date argon2id hash is left alone"""
+        values = await self._login(pwd_context.hash("password123"))
+        
+        assert "hashed_password" not in values
+        assert values["last_login"] is not None
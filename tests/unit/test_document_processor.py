@@ -0,0 +1,148 @@
+"""Unit tests for document text extraction and chunking helpers"""
+
+import json
+import random
+import re
+from collections import Counter
+
+import pytest
+import tiktoken
+
+from utils import document_processor
+from utils.document_processor import ChunkingStrategy, DocumentProcessor, _parallel_encode
+
+
+JSON_DOCUMENTS = {
+    "object": {
+        "title": "Reset your password",
+        "tags": ["account", "security"],
+        "steps": [{"n": 1, "text": "Open settings"}, {"n": 2, "text": "Choose \"Reset\"\nthen confirm"}],
+        "rating": 4.5,
+        "meta": {"lang": "fr", "author": "Zoë", "draft": False, "reviewer": None},
+        "empty": {},
+    },
+    "array": [{"q": "Where is my invoice?", "a": "Billing > Invoices"}, [1, 2.0, "x"], "plain", 3],
+    "empty-object": {},
+    "scalar": "just a string",
+}
+
+
+# cl100k_base's pre-tokenizer split pattern; its merge table needs a download,
+# so the tests train a small BPE over the same fragments instead
+CL100K_PAT_STR = (
+    r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}+|\p{N}{1,3}"""
+    r"""| ?[^\s\p{L}\p{N}]++[\r\n]*|\s*[\r\n]|\s+(?!\S)|\s+"""
+)
+
+TEXT_FRAGMENTS = {
+    "multibyte": ["Café naïve résumé", "Привет, как дела?", "日本語のテキストです。", "Straße über Ärger"],
+    "emoji": ["🎉👍🏽", "🇫🇷 ok", "🧑‍💻🧑‍💻", "✨ fin ✨"],
+    "whitespace": ["\n\n\n", "\t\t  indented\r\n", "    ", " a \n b\n\n  c"],
+}
+TEXT_FRAGMENTS["mixed"] = [f for fragments in TEXT_FRAGMENTS.values() for f in fragments] + ["don't we'll 12345"]
+
+
+def _sample_text(kind: str, seed: int, pieces: int = 400) -> str:
+    """Deterministic text built from one TEXT_FRAGMENTS family"""
+    rng = random.Random(seed)
+    return "".join(rng.choice(TEXT_FRAGMENTS[kind]) for _ in range(pieces))
+
+
+def _train_bpe(corpus: str, n_merges: int) -> dict:
+    """Byte-level BPE merge ranks learned greedily from corpus"""
+    ranks = {bytes([b]): b for b in range(256)}
+    words = [[bytes([b]) for b in w.encode()] for w in re.findall(r" ?\S+|\s+", corpus)]
+    for _ in range(n_merges):
+        pairs = Counter(pair for w in words for pair in zip(w, w[1:]))
+        if not pairs:
+            break
+        (a, b), _ = pairs.most_common(1)[0]
+        ranks[a + b] = len(ranks)
+        merged_words = []
+        for w in words:
+            merged, i = [], 0
+            while i < len(w):
+                if i + 1 < len(w) and w[i] == a and w[i + 1] == b:
+                    merged.append(a + b)
+                    i += 2
+                else:
+                    merged.append(w[i])
+                    i += 1
+            merged_words.append(merged)
+        words = merged_words
+    return ranks
+
+
+@pytest.fixture(scope="module")
+def bpe_encoding():
+    """tiktoken Encoding with cl100k's split pattern and a locally trained BPE
+
+    Merges span UTF-8 byte boundaries, so windows can meet inside a character.
+    """
+    corpus = _sample_text("mixed", seed=0, pieces=600)
+    return tiktoken.Encoding(
+        name="test_bpe",
+        pat_str=CL100K_PAT_STR,
+        mergeable_ranks=_train_bpe(corpus, 150),
+        special_tokens={},
+    )
+
+
+@pytest.mark.unit
+class TestParallelEncode:
+    """Tests for stitching parallel-encoded windows back together"""
+    
+    @pytest.mark.parametrize("kind", TEXT_FRAGMENTS)
+    @pytest.mark.parametrize("seed", [1, 2])
+    def test_matches_serial_encode(self, bpe_encoding, kind, seed):
+        """Test that the merged windows equal a serial encode of the text"""
+        text = _sample_text(kind, seed)
+        
+        tokens = _parallel_encode(text, bpe_encoding, n_workers=4, overlap_chars=64)
+        
+        assert tokens is not None
+        assert list(tokens) == bpe_encoding.encode(text)
+    
+    def test_encode_and_chunk_uses_parallel_path(self, bpe_encoding, monkeypatch):
+        """Test that texts over the threshold are stitched and chunk like serial"""
+        text = _sample_text("mixed", seed=3)
+        calls = []
+        
+        def _spy(*args, **kwargs):
+            calls.append(result := _parallel_encode(*args, **kwargs))
+            return result
+        
+        monkeypatch.setattr(document_processor, "_get_encoding", lambda name="cl100k_base": bpe_encoding)
+        monkeypatch.setattr(document_processor, "_parallel_encode", _spy)
+        monkeypatch.setattr(document_processor, "PARALLEL_ENCODE_THRESHOLD", 0)
+        monkeypatch.setattr(document_processor.os, "cpu_count", lambda: 4)
+        
+        total, chunks, _ = ChunkingStrategy.encode_and_chunk(text, max_tokens=64, overlap_tokens=8)
+        
+        serial = bpe_encoding.encode(text)
+        expected = [bpe_encoding.decode(serial[start:start + 64]) for start in range(0, len(serial), 56)]
+        assert calls and calls[0] is not None
+        assert total == len(serial)
+        assert chunks == [chunk for chunk in expected if len(chunk) > DocumentProcessor.MIN_CHUNK_SIZE]
+
+
+@pytest.mark.unit
+class TestExtractTextFromJson:
+    """Tests for DocumentProcessor.extract_text_from_json"""
+    
+    @pytest.mark.parametrize("name", JSON_DOCUMENTS)
+    def test_streamed_text_matches_in_memory_text(self, name, tmp_path, monkeypatch):
+        """Test that files above the streaming threshold extract to the same text"""
+        file_path = tmp_path / f"{name}.json"
+        file_path.write_text(json.dumps(JSON_DOCUMENTS[name]), encoding="utf-8")
+        
+        in_memory = DocumentProcessor.extract_text_from_json(str(file_path))
+        monkeypatch.setattr(document_processor, "JSON_STREAM_THRESHOLD", 0)
+        streamed = DocumentProcessor.extract_text_from_json(str(file_path))
+        
+        assert streamed == in_memory
+    
+    def test_missing_file_raises_extraction_error(self, tmp_path):
+        """Test that an unreadable path raises the documented extraction error"""
+        with pytest.raises(Exception, match="Failed to extract text from JSON"):
+            DocumentProcessor.extract_text_from_json(str(tmp_path / "missing.json"))
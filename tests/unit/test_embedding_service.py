@@ -0,0 +1,60 @@
+"""Unit tests for the coalescing GPU embedding batcher"""
+
+import asyncio
+import numpy as np
+import pytest
+
+from stores import embedding_service
+from stores.embedding_service import _CoalescingBatcher
+
+
+@pytest.mark.unit
+class TestCoalescingBatcher:
+    """Tests for _CoalescingBatcher request fusing"""
+    
+    @pytest.fixture
+    def gpu_calls(self, monkeypatch):
+        """Record each _encode_on_gpu call; a text's embedding is its length"""
+        calls = []
+        
+        def _encode(batch, batch_size):
+            calls.append((list(batch), batch_size))
+            return np.array([[len(text)] for text in batch], dtype=np.float32)
+        
+        monkeypatch.setattr(embedding_service, "_encode_on_gpu", _encode)
+        return calls
+    
+    async def test_requests_grouped_by_batch_size(self, gpu_calls):
+        """Test that each batch_size is encoded with its own shape"""
+        batcher = _CoalescingBatcher(window=0.05, max_batch=1024)
+        
+        results = await asyncio.gather(
+            batcher.embed(["a", "bb"], 32),
+            batcher.embed(["ccc"], 8),
+            batcher.embed(["dddd"], 32),
+        )
+        
+        assert sorted(gpu_calls, key=lambda call: call[1]) == [
+            (["ccc"], 8),
+            (["a", "bb", "dddd"], 32),
+        ]
+        assert [r.ravel().tolist() for r in results] == [[1, 2], [3], [4]]
+    
+    async def test_encode_failure_only_fails_its_group(self, monkeypatch):
+        """Test that an error in one batch_size group leaves the others resolved"""
+        def _encode(batch, batch_size):
+            if batch_size == 8:
+                raise RuntimeError("CUDA graph capture failed")
+            return np.ones((len(batch), 1), dtype=np.float32)
+        
+        monkeypatch.setattr(embedding_service, "_encode_on_gpu", _encode)
+        batcher = _CoalescingBatcher(window=0.05, max_batch=1024)
+        
+        ok, failed = await asyncio.gather(
+            batcher.embed(["a"], 32),
+            batcher.embed(["b"], 8),
+            return_exceptions=True,
+        )
+        
+        assert ok.shape == (1, 1)
+        assert isinstance(failed, RuntimeError)
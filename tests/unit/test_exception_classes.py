@@ -0,0 +1,135 @@
+"""Unit tests for the exception classes"""
+
+import pickle
+import pytest
+
+from helpers.exceptions import (
+    AppException,
+    ValidationException,
+    ResourceNotFoundException,
+    PermissionException,
+    DatabaseException,
+    FileUploadException,
+    ProcessingException,
+    AuthenticationException,
+    ConfigException,
+)
+
+pytestmark = pytest.mark.unit
+
+
+# Tests for base AppException class
+def test_app_exception_initialization():
+    """Test that AppException initializes correctly"""
+    exc = AppException("Test error", "TEST_CODE")
+    assert exc.message == "Test error"
+    assert exc.code == "TEST_CODE"
+
+
+def test_app_exception_default_code():
+    """Test that AppException uses default code"""
+    exc = AppException("Test error")
+    assert exc.code == "APP_ERROR"
+
+
+def test_app_exception_message_in_string():
+    """Test that exception message is included in string representation"""
+    exc = AppException("Test message")
+    assert "Test message" in str(exc)
+
+
+# Tests for ResourceNotFoundException class
+def test_resource_not_found_exception_initialization():
+    """Test that ResourceNotFoundException initializes correctly"""
+    exc = ResourceNotFoundException("Project", 123)
+    assert exc.code == "RESOURCE_NOT_FOUND"
+    assert exc.resource_type == "Project"
+    assert exc.resource_id == 123
+
+
+def test_resource_not_found_exception_message_format():
+    """Test that ResourceNotFoundException formats message correctly"""
+    exc = ResourceNotFoundException("User", 456)
+    assert "User" in exc.message
+    assert "456" in exc.message
+    assert "not found" in exc.message
+
+
+# Tests for the exception hierarchy
+@pytest.mark.parametrize("cls", [
+    AppException,
+    ValidationException,
+    ResourceNotFoundException,
+    PermissionException,
+    DatabaseException,
+    FileUploadException,
+    ProcessingException,
+    AuthenticationException,
+    ConfigException,
+])
+def test_inherits_app_exception(cls):
+    """Test every exception class derives from AppException and Exception"""
+    assert issubclass(cls, AppException)
+    assert issubclass(cls, Exception)
+
+
+# Tests for exceptions carrying an optional context attribute
+CONTEXT_CASES = [
+    (ValidationException, "VALIDATION_ERROR", "field", "email"),
+    (DatabaseException, "DATABASE_ERROR", "operation", "INSERT"),
+    (FileUploadException, "FILE_UPLOAD_ERROR", "reason", "File too large"),
+    (ProcessingException, "PROCESSING_ERROR", "step", "tokenization"),
+    (ConfigException, "CONFIG_ERROR", "config_key", "JWT_SECRET_KEY"),
+]
+
+
+@pytest.mark.parametrize("cls,code,attr,value", CONTEXT_CASES)
+def test_context_exception(cls, code, attr, value):
+    """Test message, code, context attribute and its None default"""
+    exc = cls("Operation failed")
+    assert exc.message == "Operation failed"
+    assert exc.code == code
+    assert getattr(exc, attr) is None
+    
+    exc = cls("Operation failed", **{attr: value})
+    assert getattr(exc, attr) == value
+
+
+@pytest.mark.parametrize("cls,code,attr,value", CONTEXT_CASES)
+def test_context_exception_survives_pickle(cls, code, attr, value):
+    """Test message, code and context attribute survive a pickle round trip (Celery, process pools)"""
+    exc = pickle.loads(pickle.dumps(cls("Operation failed", **{attr: value})))
+    assert exc.message == "Operation failed"
+    assert exc.code == code
+    assert getattr(exc, attr) == value
+
+
+# Tests for exceptions whose message is optional
+@pytest.mark.parametrize("cls,code,default_message", [
+    (PermissionException, "PERMISSION_DENIED", "Permission denied"),
+    (AuthenticationException, "AUTHENTICATION_ERROR", "Authentication failed"),
+])
+def test_default_message_exception(cls, code, default_message):
+    """Test default message, code and custom message"""
+    exc = cls()
+    assert exc.message == default_message
+    assert exc.code == code
+    
+    assert cls("Custom message").message == "Custom message"
+
+
+# Tests for edge cases and special scenarios
+@pytest.mark.parametrize("message", [
+    "Invalid: <>&\"'",
+    "Erreur: données invalides ñ日本語",
+    "A" * 16,
+], ids=["special-characters", "unicode", "repeated-character"])
+def test_message_preserved(message):
+    """Test exception keeps special, unicode and repeated-character messages intact"""
+    assert ValidationException(message).message == message
+
+
+@pytest.mark.parametrize("resource_id", [0, -1, "uuid-123", 456])
+def test_resource_id_in_message(resource_id):
+    """Test ResourceNotFoundException includes zero, negative, string and int IDs in its message"""
+    assert str(resource_id) in ResourceNotFoundException("Resource", resource_id).message
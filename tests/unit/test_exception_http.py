@@ -0,0 +1,144 @@
+"""Unit tests for converting application exceptions to HTTP exceptions"""
+
+import pytest
+from dataclasses import dataclass, field
+from fastapi import status
+
+from helpers.exceptions import (
+    AppException,
+    ValidationException,
+    ResourceNotFoundException,
+    PermissionException,
+    DatabaseException,
+    FileUploadException,
+    ProcessingException,
+    AuthenticationException,
+    ConfigException,
+    app_exception_to_http_exception,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@dataclass(frozen=True)
+class ExceptionCase:
+    """One exception type, how to build it and what it converts to
+    
+    Attributes:
+        id: Test id for the case
+        cls: Exception class under test
+        code: Expected error code
+        http_status: Expected status after app_exception_to_http_exception
+        args: Positional arguments for the exception
+        kwargs: Optional context attribute passed by keyword
+        extra_detail: Entries the HTTPException detail must contain besides error
+    """
+    id: str
+    cls: type
+    code: str
+    http_status: int
+    args: tuple
+    kwargs: dict = field(default_factory=dict)
+    extra_detail: dict = field(default_factory=dict)
+
+
+CASES = (
+    ExceptionCase("validation", ValidationException, "VALIDATION_ERROR",
+                  status.HTTP_400_BAD_REQUEST, ("Invalid input",), {"field": "email"},
+                  {"message": "Invalid input", "field": "email"}),
+    ExceptionCase("authentication", AuthenticationException, "AUTHENTICATION_ERROR",
+                  status.HTTP_401_UNAUTHORIZED, ("Invalid token",),
+                  extra_detail={"message": "Invalid token"}),
+    ExceptionCase("permission", PermissionException, "PERMISSION_DENIED",
+                  status.HTTP_403_FORBIDDEN, ("Insufficient permissions",)),
+    ExceptionCase("resource-not-found", ResourceNotFoundException, "RESOURCE_NOT_FOUND",
+                  status.HTTP_404_NOT_FOUND, ("Project", 123),
+                  extra_detail={"resource_type": "Project"}),
+    ExceptionCase("file-upload", FileUploadException, "FILE_UPLOAD_ERROR",
+                  status.HTTP_400_BAD_REQUEST, ("Upload failed",), {"reason": "File too large"},
+                  {"reason": "File too large"}),
+    ExceptionCase("processing", ProcessingException, "PROCESSING_ERROR",
+                  status.HTTP_422_UNPROCESSABLE_ENTITY, ("Processing failed",), {"step": "tokenization"}),
+    ExceptionCase("database", DatabaseException, "DATABASE_ERROR",
+                  status.HTTP_500_INTERNAL_SERVER_ERROR, ("Connection failed",), {"operation": "INSERT"}),
+    ExceptionCase("config", ConfigException, "CONFIG_ERROR",
+                  status.HTTP_500_INTERNAL_SERVER_ERROR, ("Invalid configuration",),
+                  {"config_key": "JWT_SECRET_KEY"}),
+    ExceptionCase("generic", AppException, "APP_ERROR",
+                  status.HTTP_500_INTERNAL_SERVER_ERROR, ("Something went wrong",)),
+)
+
+
+@pytest.fixture(scope="session")
+def http_exc_map():
+    """Convert every CASES exception once and key the results by case id"""
+    return {
+        case.id: app_exception_to_http_exception(case.cls(*case.args, **case.kwargs))
+        for case in CASES
+    }
+
+
+# Tests for app_exception_to_http_exception converter function
+@pytest.mark.parametrize("case", CASES, ids=lambda case: case.id)
+def test_convert(http_exc_map, case):
+    """Test converting each exception type to an HTTPException"""
+    http_exc = http_exc_map[case.id]
+    
+    assert http_exc.status_code == case.http_status
+    assert http_exc.detail["error"] == case.code
+    for key, value in case.extra_detail.items():
+        assert http_exc.detail[key] == value
+
+
+def test_http_exception_detail_format():
+    """Test that HTTP exception detail always has error and message"""
+    exc = ValidationException("Test error")
+    http_exc = app_exception_to_http_exception(exc)
+    
+    assert "error" in http_exc.detail
+    assert "message" in http_exc.detail
+
+
+def test_http_exception_no_optional_fields_when_none():
+    """Test that optional fields are not included when they are None"""
+    exc = ValidationException("Test error")
+    http_exc = app_exception_to_http_exception(exc)
+    
+    assert "field" not in http_exc.detail
+
+
+def test_unknown_error_code_defaults_to_500():
+    """Test that unknown error codes default to 500 status"""
+    exc = AppException("Unknown error", "UNKNOWN_CODE")
+    http_exc = app_exception_to_http_exception(exc)
+    
+    assert http_exc.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+class QuotaException(AppException):
+    """AppException subclass with an error code _HTTP_DISPATCH doesn't list"""
+    
+    def __init__(self, message: str, reason: str):
+        super().__init__(message, "QUOTA_EXCEEDED")
+        self.reason = reason
+
+
+def test_unlisted_subclass_keeps_context_attributes():
+    """Test that a subclass with an unknown code still carries its context"""
+    http_exc = app_exception_to_http_exception(QuotaException("Over quota", reason="10 uploads per day"))
+    
+    assert http_exc.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert http_exc.detail == {
+        "error": "QUOTA_EXCEEDED",
+        "message": "Over quota",
+        "reason": "10 uploads per day",
+    }
+
+
+def test_http_exception_preserves_all_attributes():
+    """Test that conversion to HTTP exception preserves all attributes"""
+    exc = ProcessingException("Failed at step", step="parsing")
+    http_exc = app_exception_to_http_exception(exc)
+    
+    assert http_exc.detail["message"] == "Failed at step"
+    assert http_exc.detail["error"] == "PROCESSING_ERROR"
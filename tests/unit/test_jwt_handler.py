@@ -1,9 +1,11 @@
 """Unit tests for the JWT handler module"""
 
+import hmac
 import pytest
 import jwt
-from datetime import datetime, timedelta
-from unittest.mock import Mock, patch, MagicMock
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
 from fastapi import HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
 
@@ -13,16 +15,25 @@ from helpers.jwt_handler import (
     get_current_user,
     security,
 )
-from helpers.config import Settings
+
+
+@pytest.fixture(autouse=True)
+def patch_get_settings(monkeypatch, base_settings):
+    """Resolve jwt_handler's get_settings to base_settings for every test
+    
+    Tests pass settings to verify_token explicitly; this only keeps the
+    Depends default from building the app-wide Settings.
+    """
+    monkeypatch.setattr("helpers.jwt_handler.get_settings", lambda: base_settings)
 
 
 @pytest.mark.unit
 class TestCreateAccessToken:
     """Tests for token creation"""
     
-    def test_create_access_token_basic(self):
+    def test_create_access_token_basic(self, base_settings):
         """Test basic token creation"""
-        settings = Settings()
+        settings = base_settings
         data = {"sub": "user123"}
         
         token = create_access_token(data, settings)
@@ -30,86 +41,39 @@ class TestCreateAccessToken:
         assert isinstance(token, str)
         assert len(token) > 0
     
-    def test_create_access_token_contains_payload(self):
-        """Test that created token contains the payload data"""
-        settings = Settings()
-        data = {"sub": "user123"}
-        
-        token = create_access_token(data, settings)
-        decoded = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        
-        assert decoded["sub"] == "user123"
-    
-    def test_create_access_token_contains_expiration(self):
-        """Test that created token contains expiration"""
-        settings = Settings()
-        data = {"sub": "user123"}
-        
-        token = create_access_token(data, settings)
-        decoded = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        
-        assert "exp" in decoded
-        assert isinstance(decoded["exp"], (int, float))
-    
-    def test_create_access_token_expiration_is_in_future(self):
-        """Test that expiration time is in the future"""
-        settings = Settings()
-        data = {"sub": "user123"}
-        now = datetime.utcnow()
-        
-        token = create_access_token(data, settings)
-        decoded = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        
-        exp_time = datetime.fromtimestamp(decoded["exp"])
-        assert exp_time > now
+    @pytest.fixture(scope="class")
+    def encoded_pair(self, base_settings):
+        """Encode one multi-claim token and decode it once for the whole class"""
+        before_now = time.time()
+        token = create_access_token(
+            {"sub": "user123", "role": "admin", "email": "user@example.com"},
+            base_settings
+        )
+        decoded = jwt.decode(token, base_settings.JWT_SECRET_KEY, algorithms=[base_settings.JWT_ALGORITHM])
+        return SimpleNamespace(token=token, decoded=decoded, before_now=before_now, settings=base_settings)
     
-    def test_create_access_token_with_multiple_claims(self):
-        """Test token creation with multiple claims"""
-        settings = Settings()
-        data = {"sub": "user123", "role": "admin", "email": "user@example.com"}
-        
-        token = create_access_token(data, settings)
-        decoded = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        
-        assert decoded["sub"] == "user123"
-        assert decoded["role"] == "admin"
-        assert decoded["email"] == "user@example.com"
+    @pytest.mark.parametrize("check", [
+        # Payload claims survive the round trip
+        lambda pair: pair.decoded["sub"] == "user123",
+        lambda pair: pair.decoded["role"] == "admin" and pair.decoded["email"] == "user@example.com",
+        # Expiration is a numeric timestamp in the future
+        lambda pair: isinstance(pair.decoded.get("exp"), (int, float)),
+        lambda pair: pair.decoded["exp"] > pair.before_now,
+        # Expiration matches JWT_EXPIRATION_HOURS to within an hour
+        lambda pair: abs(
+            pair.decoded["exp"] - pair.before_now - pair.settings.JWT_EXPIRATION_HOURS * 3600
+        ) < 3600,
+        # Header names the configured algorithm
+        lambda pair: jwt.get_unverified_header(pair.token)["alg"] == pair.settings.JWT_ALGORITHM,
+    ], ids=["payload", "multiple-claims", "expiration", "expiration-in-future",
+            "respects-expiration-hours", "algorithm"])
+    def test_create_access_token_round_trip(self, encoded_pair, check):
+        """Test the decoded token's claims, expiration and algorithm"""
+        assert check(encoded_pair)
     
-    def test_create_access_token_respects_expiration_hours(self):
-        """Test that expiration respects JWT_EXPIRATION_HOURS setting"""
-        settings = Settings()
-        original_hours = settings.JWT_EXPIRATION_HOURS
-        data = {"sub": "user123"}
-        
-        before_now = datetime.utcnow()
-        token = create_access_token(data, settings)
-        after_now = datetime.utcnow()
-        decoded = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        
-        exp_value = decoded["exp"]
-        if isinstance(exp_value, datetime):
-            exp_time = exp_value
-        else:
-            exp_time = datetime.fromtimestamp(exp_value)
-        
-        expected_duration = timedelta(hours=original_hours).total_seconds()
-        actual_duration = (exp_time - before_now).total_seconds()
-        
-        assert expected_duration - 3600 < actual_duration < expected_duration + 3600
-    
-    def test_create_access_token_uses_correct_algorithm(self):
-        """Test that token uses the correct algorithm"""
-        settings = Settings()
-        data = {"sub": "user123"}
-        
-        token = create_access_token(data, settings)
-        decoded = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        
-        assert decoded is not None
-    
-    def test_create_access_token_does_not_modify_original_data(self):
+    def test_create_access_token_does_not_modify_original_data(self, base_settings):
         """Test that creating token doesn't modify original data"""
-        settings = Settings()
+        settings = base_settings
         data = {"sub": "user123"}
         original_data = data.copy()
         
@@ -117,12 +81,10 @@ class TestCreateAccessToken:
         
         assert data == original_data
     
-    def test_create_access_token_with_different_secrets(self):
+    def test_create_access_token_with_different_secrets(self, base_settings):
         """Test that tokens created with different secrets can't decode each other"""
-        settings1 = Settings()
-        settings1.JWT_SECRET_KEY = "secret1"
-        settings2 = Settings()
-        settings2.JWT_SECRET_KEY = "secret2"
+        settings1 = base_settings.model_copy(update={"JWT_SECRET_KEY": "secret1"})
+        settings2 = base_settings.model_copy(update={"JWT_SECRET_KEY": "secret2"})
         data = {"sub": "user123"}
         
         token = create_access_token(data, settings1)
@@ -135,99 +97,97 @@ class TestCreateAccessToken:
 class TestVerifyToken:
     """Tests for token verification"""
     
-    def test_verify_token_with_valid_token(self):
+    @pytest.fixture(scope="class")
+    def valid_token(self, make_token):
+        """Token for sub=user123, signed once for the whole class"""
+        return make_token({"sub": "user123"})
+    
+    @pytest.fixture(scope="class")
+    def valid_creds(self, valid_token):
+        """Bearer credentials wrapping valid_token, built once for the whole class"""
+        return HTTPAuthorizationCredentials.model_construct(scheme="Bearer", credentials=valid_token)
+    
+    def test_verify_token_with_valid_token(self, base_settings, valid_creds):
         """Test verifying a valid token"""
-        settings = Settings()
-        data = {"sub": "user123"}
-        token = create_access_token(data, settings)
-        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
-        
-        with patch('helpers.jwt_handler.get_settings', return_value=settings):
-            payload = verify_token(credentials, settings)
+        payload = verify_token(valid_creds, base_settings)
         
         assert payload["sub"] == "user123"
     
-    def test_verify_token_without_credentials(self):
+    def test_verify_token_without_credentials(self, base_settings):
         """Test that missing credentials raises HTTPException"""
-        settings = Settings()
+        settings = base_settings
         
         with pytest.raises(HTTPException) as exc_info:
-            with patch('helpers.jwt_handler.get_settings', return_value=settings):
-                verify_token(None, settings)
+            verify_token(None, settings)
         
         assert exc_info.value.status_code == status.HTTP_403_FORBIDDEN
     
-    def test_verify_token_with_expired_token(self):
+    def test_verify_token_with_expired_token(self, base_settings):
         """Test that expired token raises HTTPException"""
-        settings = Settings()
-        settings.JWT_EXPIRATION_HOURS = -1
+        settings = base_settings.model_copy(update={"JWT_EXPIRATION_HOURS": -1})
         data = {"sub": "user123"}
         
         token = create_access_token(data, settings)
-        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        credentials = HTTPAuthorizationCredentials.model_construct(scheme="Bearer", credentials=token)
         
-        with pytest.raises(HTTPException) as exc_info:
-            with patch('helpers.jwt_handler.get_settings', return_value=settings):
-                verify_token(credentials, settings)
+        with pytest.raises(HTTPException, match=r"(?i)expired") as exc_info:
+            verify_token(credentials, settings)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
-        assert "expired" in exc_info.value.detail.lower()
     
-    def test_verify_token_with_invalid_token(self):
+    def test_verify_token_with_invalid_token(self, base_settings):
         """Test that invalid token raises HTTPException"""
-        settings = Settings()
-        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="invalid.token.here")
+        settings = base_settings
+        credentials = HTTPAuthorizationCredentials.model_construct(scheme="Bearer", credentials="invalid.token.here")
         
-        with pytest.raises(HTTPException) as exc_info:
-            with patch('helpers.jwt_handler.get_settings', return_value=settings):
-                verify_token(credentials, settings)
+        with pytest.raises(HTTPException, match=r"(?i)invalid") as exc_info:
+            verify_token(credentials, settings)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
-        assert "invalid" in exc_info.value.detail.lower()
     
-    def test_verify_token_with_tampered_token(self):
+    def test_verify_token_with_tampered_token(self, base_settings, valid_token):
         """Test that tampered token raises HTTPException"""
-        settings = Settings()
-        data = {"sub": "user123"}
-        token = create_access_token(data, settings)
+        settings = base_settings
         
-        tampered_token = token[:-5] + "XXXXX"
-        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=tampered_token)
+        tampered_token = valid_token[:-5] + "XXXXX"
+        credentials = HTTPAuthorizationCredentials.model_construct(scheme="Bearer", credentials=tampered_token)
         
         with pytest.raises(HTTPException) as exc_info:
-            with patch('helpers.jwt_handler.get_settings', return_value=settings):
-                verify_token(credentials, settings)
+            verify_token(credentials, settings)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
     
-    def test_verify_token_preserves_payload(self):
+    def test_verify_token_compares_signature_in_constant_time(self, base_settings, valid_creds):
+        """Test that HS256 signatures are checked with hmac.compare_digest"""
+        with patch.object(jwt.algorithms.hmac, "compare_digest", wraps=hmac.compare_digest) as compare:
+            verify_token(valid_creds, base_settings)
+        
+        compare.assert_called_once()
+    
+    def test_verify_token_preserves_payload(self, base_settings, make_token):
         """Test that verify_token returns complete payload"""
-        settings = Settings()
+        settings = base_settings
         data = {"sub": "user123", "role": "admin", "email": "user@example.com"}
-        token = create_access_token(data, settings)
-        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        token = make_token(data)
+        credentials = HTTPAuthorizationCredentials.model_construct(scheme="Bearer", credentials=token)
         
-        with patch('helpers.jwt_handler.get_settings', return_value=settings):
-            payload = verify_token(credentials, settings)
+        payload = verify_token(credentials, settings)
         
         assert payload["sub"] == "user123"
         assert payload["role"] == "admin"
         assert payload["email"] == "user@example.com"
     
-    def test_verify_token_with_wrong_secret(self):
+    def test_verify_token_with_wrong_secret(self, base_settings):
         """Test that token signed with different secret can't be verified"""
-        settings1 = Settings()
-        settings1.JWT_SECRET_KEY = "secret1"
-        settings2 = Settings()
-        settings2.JWT_SECRET_KEY = "secret2"
+        settings1 = base_settings.model_copy(update={"JWT_SECRET_KEY": "secret1"})
+        settings2 = base_settings.model_copy(update={"JWT_SECRET_KEY": "secret2"})
         
         data = {"sub": "user123"}
         token = create_access_token(data, settings1)
-        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        credentials = HTTPAuthorizationCredentials.model_construct(scheme="Bearer", credentials=token)
         
         with pytest.raises(HTTPException) as exc_info:
-            with patch('helpers.jwt_handler.get_settings', return_value=settings2):
-                verify_token(credentials, settings2)
+            verify_token(credentials, settings2)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
 
@@ -275,42 +235,40 @@ class TestGetCurrentUser:
         assert result["user_id"] == "user123"
     
     @pytest.mark.asyncio
-    async def test_get_current_user_with_different_user_ids(self):
+    @pytest.mark.parametrize("user_id", ["user1", "123", "uuid-12345", "user@example.com"])
+    async def test_get_current_user_with_different_user_ids(self, user_id):
         """Test with different user ID formats"""
-        for user_id in ["user1", "123", "uuid-12345", "user@example.com"]:
-            payload = {"sub": user_id}
-            result = await get_current_user(payload)
-            assert result["user_id"] == user_id
+        payload = {"sub": user_id}
+        result = await get_current_user(payload)
+        assert result["user_id"] == user_id
 
 
 @pytest.mark.unit
 class TestJWTIntegration:
     """Integration tests for JWT workflow"""
     
-    def test_full_jwt_workflow(self):
+    def test_full_jwt_workflow(self, base_settings):
         """Test complete JWT workflow: create -> verify -> extract user"""
-        settings = Settings()
+        settings = base_settings
         user_id = "user123"
         
         data = {"sub": user_id}
         token = create_access_token(data, settings)
         
-        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
-        with patch('helpers.jwt_handler.get_settings', return_value=settings):
-            payload = verify_token(credentials, settings)
+        credentials = HTTPAuthorizationCredentials.model_construct(scheme="Bearer", credentials=token)
+        payload = verify_token(credentials, settings)
         
         assert payload["sub"] == user_id
     
-    def test_jwt_workflow_with_admin_user(self):
+    def test_jwt_workflow_with_admin_user(self, base_settings):
         """Test JWT workflow with additional admin role"""
-        settings = Settings()
+        settings = base_settings
         
         data = {"sub": "admin_user", "role": "admin"}
         token = create_access_token(data, settings)
         
-        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
-        with patch('helpers.jwt_handler.get_settings', return_value=settings):
-            payload = verify_token(credentials, settings)
+        credentials = HTTPAuthorizationCredentials.model_construct(scheme="Bearer", credentials=token)
+        payload = verify_token(credentials, settings)
         
         assert payload["sub"] == "admin_user"
         assert payload["role"] == "admin"
@@ -320,9 +278,9 @@ class TestJWTIntegration:
 class TestJWTEdgeCases:
     """Tests for edge cases"""
     
-    def test_create_token_with_empty_data(self):
+    def test_create_token_with_empty_data(self, base_settings):
         """Test creating token with empty data dict"""
-        settings = Settings()
+        settings = base_settings
         data = {}
         
         token = create_access_token(data, settings)
@@ -330,9 +288,9 @@ class TestJWTEdgeCases:
         
         assert "exp" in decoded
     
-    def test_create_token_with_unicode_payload(self):
+    def test_create_token_with_unicode_payload(self, base_settings):
         """Test creating token with unicode characters"""
-        settings = Settings()
+        settings = base_settings
         data = {"sub": "user_日本語_ñ"}
         
         token = create_access_token(data, settings)
@@ -340,9 +298,9 @@ class TestJWTEdgeCases:
         
         assert "日本語" in decoded["sub"]
     
-    def test_create_token_with_special_characters(self):
+    def test_create_token_with_special_characters(self, base_settings):
         """Test creating token with special characters"""
-        settings = Settings()
+        settings = base_settings
         data = {"sub": "user@example.com", "email": "test+test@example.com"}
         
         token = create_access_token(data, settings)
@@ -351,9 +309,9 @@ class TestJWTEdgeCases:
         assert "@" in decoded["sub"]
         assert "+" in decoded["email"]
     
-    def test_token_algorithm_consistency(self):
+    def test_token_algorithm_consistency(self, base_settings):
         """Test that algorithm is consistent"""
-        settings = Settings()
+        settings = base_settings
         assert settings.JWT_ALGORITHM == "HS256"
         
         data = {"sub": "user123"}
@@ -362,30 +320,28 @@ class TestJWTEdgeCases:
         decoded = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         assert decoded is not None
     
-    def test_verify_token_with_empty_scheme(self):
+    def test_verify_token_with_empty_scheme(self, base_settings, make_token):
         """Test verify with empty scheme"""
-        settings = Settings()
+        settings = base_settings
         data = {"sub": "user123"}
-        token = create_access_token(data, settings)
-        credentials = HTTPAuthorizationCredentials(scheme="", credentials=token)
+        token = make_token(data)
+        credentials = HTTPAuthorizationCredentials.model_construct(scheme="", credentials=token)
         
-        with patch('helpers.jwt_handler.get_settings', return_value=settings):
-            payload = verify_token(credentials, settings)
+        payload = verify_token(credentials, settings)
         
         assert payload["sub"] == "user123"
     
-    def test_expiration_boundary(self):
+    def test_expiration_boundary(self, base_settings):
         """Test token expiration at boundary"""
-        settings = Settings()
+        settings = base_settings
         hours = settings.JWT_EXPIRATION_HOURS
         data = {"sub": "user123"}
         
         token = create_access_token(data, settings)
         decoded = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         
-        exp_time = datetime.fromtimestamp(decoded["exp"])
-        now = datetime.utcnow()
-        duration = (exp_time - now).total_seconds()
+        # exp is epoch seconds, so compare it to time.time() directly
+        duration = decoded["exp"] - time.time()
         
         expected_seconds = hours * 3600
         assert expected_seconds - 3600 < duration < expected_seconds + 3600
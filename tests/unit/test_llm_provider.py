@@ -0,0 +1,109 @@
+"""Unit tests for LLM provider helpers"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import AsyncMock
+
+from utils.llm_provider import BaseLLMProvider
+
+
+class FakeProvider(BaseLLMProvider):
+    """Provider that echoes prompts and records how many calls overlap"""
+    
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.kwargs = []
+    
+    async def generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.7, **kwargs) -> str:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.kwargs.append({"max_tokens": max_tokens, "temperature": temperature})
+        # Earlier prompts sleep longest, so calls finish out of prompt order
+        await asyncio.sleep(0.001 * (20 - int(prompt.split("-")[1])))
+        self.in_flight -= 1
+        return f"answer to {prompt}"
+    
+    async def generate_with_context(self, query: str, context: List[str], **kwargs) -> str:
+        return await self.generate(query, **kwargs)
+
+
+@pytest.mark.unit
+class TestGenerateBatch:
+    """Tests for BaseLLMProvider.generate_batch"""
+    
+    PROMPTS = [f"prompt-{i}" for i in range(10)]
+    
+    async def test_concurrency_bounded_by_semaphore(self):
+        """Test that no more than `concurrency` generate() calls run at once"""
+        provider = FakeProvider()
+        
+        await provider.generate_batch(self.PROMPTS, concurrency=3)
+        
+        assert provider.max_in_flight == 3
+    
+    async def test_results_follow_prompt_order(self):
+        """Test that outputs line up with inputs even when calls finish out of order"""
+        provider = FakeProvider()
+        
+        results = await provider.generate_batch(self.PROMPTS, concurrency=4)
+        
+        assert results == [f"answer to {prompt}" for prompt in self.PROMPTS]
+    
+    async def test_kwargs_forwarded_to_generate(self):
+        """Test that generation arguments reach every generate() call"""
+        provider = FakeProvider()
+        
+        await provider.generate_batch(self.PROMPTS[:2], max_tokens=64, temperature=0.1)
+        
+        assert provider.kwargs == [{"max_tokens": 64, "temperature": 0.1}] * 2
+    
+    async def test_empty_batch(self):
+        """Test that an empty prompt list returns an empty result"""
+        assert await FakeProvider().generate_batch([]) == []
+
+
+@pytest.mark.unit
+class TestProcessProviders:
+    """Tests for the process-wide providers held by routes.rag"""
+    
+    @pytest.fixture
+    def rag_routes(self, monkeypatch):
+        """routes.rag with an empty provider cache that builds FakeProviders"""
+        from routes import rag
+        monkeypatch.setattr(rag, "_LLM_PROVIDERS", {})
+        monkeypatch.setattr(rag, "_create_llm_provider", lambda settings: FakeProvider())
+        return rag
+    
+    @staticmethod
+    def _settings(**overrides):
+        """LLM settings for an OpenAI-style provider, with overrides applied"""
+        return SimpleNamespace(**{
+            "LLM_PROVIDER": "openai", "LLM_API_KEY": "key",
+            "LLM_BASE_URL": "", "LLM_MODEL": "gpt-3.5-turbo", **overrides
+        })
+    
+    def test_provider_reused_across_requests(self, rag_routes):
+        """Test that one configuration maps to a single provider instance"""
+        first = rag_routes._get_llm_provider(self._settings())
+        
+        assert rag_routes._get_llm_provider(self._settings()) is first
+        assert rag_routes._get_llm_provider(self._settings(LLM_MODEL="gpt-4")) is not first
+    
+    async def test_close_llm_providers(self, rag_routes):
+        """Test that shutdown closes every cached provider and empties the cache"""
+        providers = [
+            rag_routes._get_llm_provider(self._settings(LLM_MODEL=model))
+            for model in ("gpt-3.5-turbo", "gpt-4")
+        ]
+        for provider in providers:
+            provider.aclose = AsyncMock()
+        
+        await rag_routes.close_llm_providers()
+        
+        for provider in providers:
+            provider.aclose.assert_awaited_once()
+        assert rag_routes._LLM_PROVIDERS == {}
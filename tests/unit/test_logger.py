@@ -1,16 +1,79 @@
 """Unit tests for the logger module"""
 
+import copy
 import pytest
 import logging
 import sys
 import tempfile
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from io import StringIO
 
 from helpers.logger import ColoredFormatter, setup_logger, LOG_DIR
 
 
+# Built once; _record() hands each test a copy at the level it needs
+_RECORD_PROTOTYPE = logging.LogRecord(
+    name='test',
+    level=logging.INFO,
+    pathname='test.py',
+    lineno=1,
+    msg='Test',
+    args=(),
+    exc_info=None
+)
+
+
+def _record(levelno: int) -> logging.LogRecord:
+    """Copy of the prototype record at the given level"""
+    record = copy.copy(_RECORD_PROTOTYPE)
+    record.levelno = levelno
+    record.levelname = logging.getLevelName(levelno)
+    return record
+
+
+@pytest.fixture(scope="session")
+def shared_logger():
+    """Logger built once for tests that only inspect its level and handlers
+    
+    Tests that exercise setup_logger itself (custom levels, re-running
+    setup) still build their own.
+    """
+    return setup_logger('shared_test_logger')
+
+
+@pytest.fixture
+def closing_logger():
+    """setup_logger wrapper that closes the loggers' handlers after the test
+    
+    Without it each test leaves a RotatingFileHandler and its file open
+    until interpreter exit.
+    """
+    loggers = []
+    
+    def _make(name, **kwargs):
+        logger = setup_logger(name, **kwargs)
+        loggers.append(logger)
+        return logger
+    
+    yield _make
+    
+    for logger in loggers:
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_log_dir(tmp_path, monkeypatch):
+    """Point setup_logger at a per-test log directory
+    
+    Keeps xdist workers from appending to the same dated file in LOG_DIR.
+    """
+    monkeypatch.setattr("helpers.logger.LOG_DIR", tmp_path)
+    return tmp_path
+
+
 @pytest.mark.unit
 class TestColoredFormatter:
     """Tests for the ColoredFormatter class"""
@@ -42,15 +105,7 @@ class TestColoredFormatter:
     def test_colored_formatter_no_color_on_windows(self):
         """Test that colors are skipped on Windows"""
         formatter = ColoredFormatter(fmt='%(levelname)s - %(message)s')
-        record = logging.LogRecord(
-            name='test',
-            level=logging.INFO,
-            pathname='test.py',
-            lineno=1,
-            msg='Test message',
-            args=(),
-            exc_info=None
-        )
+        record = _record(logging.INFO)
         
         formatted = formatter.format(record)
         assert '\033[' not in formatted
@@ -60,77 +115,70 @@ class TestColoredFormatter:
     def test_colored_formatter_with_colors_on_linux(self):
         """Test that colors are applied on non-Windows systems"""
         formatter = ColoredFormatter(fmt='%(levelname)s - %(message)s')
-        record = logging.LogRecord(
-            name='test',
-            level=logging.ERROR,
-            pathname='test.py',
-            lineno=1,
-            msg='Test error',
-            args=(),
-            exc_info=None
-        )
+        record = _record(logging.ERROR)
         
         formatted = formatter.format(record)
         assert '\033[' in formatted
         assert '\033[0m' in formatted
     
-    def test_colored_formatter_all_levels(self):
+    @pytest.mark.parametrize("platform,bound_method", [
+        ('linux', '_format_colored'),
+        ('win32', '_format_plain'),
+    ])
+    def test_colored_formatter_binds_format_once(self, platform, bound_method):
+        """Test that the platform branch is taken at construction, not per record"""
+        with patch('sys.platform', platform):
+            formatter = ColoredFormatter(fmt='%(levelname)s')
+        
+        assert formatter.format == getattr(formatter, bound_method)
+    
+    @pytest.mark.parametrize("level_num,level_name", [
+        (logging.DEBUG, 'DEBUG'),
+        (logging.INFO, 'INFO'),
+        (logging.WARNING, 'WARNING'),
+        (logging.ERROR, 'ERROR'),
+        (logging.CRITICAL, 'CRITICAL'),
+    ])
+    def test_colored_formatter_all_levels(self, level_num, level_name):
         """Test formatting for all log levels"""
         formatter = ColoredFormatter(fmt='%(levelname)s')
-        levels = [
-            (logging.DEBUG, 'DEBUG'),
-            (logging.INFO, 'INFO'),
-            (logging.WARNING, 'WARNING'),
-            (logging.ERROR, 'ERROR'),
-            (logging.CRITICAL, 'CRITICAL'),
-        ]
-        
-        for level_num, level_name in levels:
-            record = logging.LogRecord(
-                name='test',
-                level=level_num,
-                pathname='test.py',
-                lineno=1,
-                msg='Test',
-                args=(),
-                exc_info=None
-            )
-            formatted = formatter.format(record)
-            assert formatted is not None
+        record = _record(level_num)
+        formatted = formatter.format(record)
+        assert level_name in formatted
 
 
 @pytest.mark.unit
 class TestSetupLogger:
     """Tests for the setup_logger function"""
     
-    def test_setup_logger_creates_logger(self):
+    def test_setup_logger_creates_logger(self, shared_logger):
         """Test that setup_logger creates a logger instance"""
-        logger = setup_logger('test_logger_1')
+        logger = shared_logger
         assert isinstance(logger, logging.Logger)
-        assert logger.name == 'test_logger_1'
+        assert logger.name == 'shared_test_logger'
     
-    def test_setup_logger_default_level(self):
+    def test_setup_logger_default_level(self, shared_logger):
         """Test that setup_logger uses INFO level by default"""
-        logger = setup_logger('test_logger_2')
+        logger = shared_logger
         assert logger.level == logging.INFO
     
-    def test_setup_logger_custom_level(self):
+    def test_setup_logger_custom_level(self, closing_logger):
         """Test that setup_logger accepts custom log level"""
-        logger = setup_logger('test_logger_3', level=logging.DEBUG)
+        logger = closing_logger('test_logger_3', level=logging.DEBUG)
         assert logger.level == logging.DEBUG
     
-    def test_setup_logger_has_handlers(self):
+    def test_setup_logger_has_handlers(self, shared_logger):
         """Test that setup_logger adds both console and file handlers"""
-        logger = setup_logger('test_logger_4')
+        logger = shared_logger
         assert len(logger.handlers) >= 2
         
         handler_types = [type(h).__name__ for h in logger.handlers]
         assert 'StreamHandler' in handler_types
         assert 'RotatingFileHandler' in handler_types
     
-    def test_setup_logger_console_handler_uses_stdout(self):
+    def test_setup_logger_console_handler_uses_stdout(self, shared_logger):
         """Test that console handler writes to stdout"""
-        logger = setup_logger('test_logger_5')
+        logger = shared_logger
         stream_handlers = [
             h for h in logger.handlers 
             if isinstance(h, logging.StreamHandler)
@@ -138,13 +186,13 @@ class TestSetupLogger:
         assert len(stream_handlers) > 0
         assert stream_handlers[0].stream == sys.stdout
     
-    def test_setup_logger_no_duplicate_handlers(self):
+    def test_setup_logger_no_duplicate_handlers(self, closing_logger):
         """Test that calling setup_logger twice doesn't duplicate handlers"""
         logger_name = 'test_logger_6'
-        logger1 = setup_logger(logger_name)
+        logger1 = closing_logger(logger_name)
         handler_count_1 = len(logger1.handlers)
         
-        logger2 = setup_logger(logger_name)
+        logger2 = closing_logger(logger_name)
         handler_count_2 = len(logger2.handlers)
         
         assert handler_count_1 == handler_count_2
@@ -159,29 +207,29 @@ class TestSetupLogger:
         assert LOG_DIR.exists()
         assert LOG_DIR.is_dir()
     
-    def test_setup_logger_creates_log_file(self):
+    def test_setup_logger_creates_log_file(self, isolated_log_dir, closing_logger):
         """Test that setup_logger creates a log file"""
-        logger = setup_logger('test_logger_7')
+        logger = closing_logger('test_logger_7')
         logger.info('Test log message')
         
-        log_files = list(LOG_DIR.glob('*.log'))
+        log_files = list(isolated_log_dir.glob('*.log'))
         assert len(log_files) > 0
     
-    def test_setup_logger_logs_to_file(self):
+    def test_setup_logger_logs_to_file(self, isolated_log_dir, closing_logger):
         """Test that logs are written to the file"""
-        logger = setup_logger('test_logger_8')
+        logger = closing_logger('test_logger_8')
         test_message = 'Test file logging message'
         logger.info(test_message)
         
-        log_files = sorted(LOG_DIR.glob('*.log'))
-        if log_files:
-            with open(log_files[-1], 'r') as f:
+        log_file = max(isolated_log_dir.glob('*.log'), key=lambda p: p.stat().st_mtime_ns, default=None)
+        if log_file:
+            with open(log_file, 'r') as f:
                 content = f.read()
                 assert test_message in content or len(content) >= 0
     
-    def test_setup_logger_formatters(self):
+    def test_setup_logger_formatters(self, shared_logger):
         """Test that handlers have proper formatters"""
-        logger = setup_logger('test_logger_9')
+        logger = shared_logger
         
         for handler in logger.handlers:
             assert handler.formatter is not None
@@ -191,9 +239,9 @@ class TestSetupLogger:
                     assert '%(asctime)s' in handler.formatter._fmt
                     assert '%(levelname)s' in handler.formatter._fmt
     
-    def test_setup_logger_file_handler_encoding(self):
+    def test_setup_logger_file_handler_encoding(self, shared_logger):
         """Test that file handler uses UTF-8 encoding"""
-        logger = setup_logger('test_logger_10')
+        logger = shared_logger
         
         file_handlers = [
             h for h in logger.handlers 
@@ -207,54 +255,54 @@ class TestSetupLogger:
 class TestLoggerFunctionality:
     """Tests for logger functionality"""
     
-    def test_logger_info_level(self):
+    def test_logger_info_level(self, closing_logger):
         """Test logging at INFO level"""
-        logger = setup_logger('test_logger_11', level=logging.INFO)
+        logger = closing_logger('test_logger_11', level=logging.INFO)
         
         with patch('sys.stdout', new=StringIO()) as fake_out:
             logger.info('Info message')
             output = fake_out.getvalue()
             assert 'INFO' in output or len(output) >= 0
     
-    def test_logger_debug_level_not_logged_by_default(self):
+    def test_logger_debug_level_not_logged_by_default(self, closing_logger):
         """Test that DEBUG messages are not logged when level is INFO"""
-        logger = setup_logger('test_logger_12', level=logging.INFO)
+        logger = closing_logger('test_logger_12', level=logging.INFO)
         
         with patch('sys.stdout', new=StringIO()) as fake_out:
             logger.debug('Debug message')
             output = fake_out.getvalue()
             assert 'Debug message' not in output
     
-    def test_logger_warning_level(self):
+    def test_logger_warning_level(self, closing_logger):
         """Test logging at WARNING level"""
-        logger = setup_logger('test_logger_13', level=logging.DEBUG)
+        logger = closing_logger('test_logger_13', level=logging.DEBUG)
         
         with patch('sys.stdout', new=StringIO()) as fake_out:
             logger.warning('Warning message')
             output = fake_out.getvalue()
             assert 'WARNING' in output or len(output) >= 0
     
-    def test_logger_error_level(self):
+    def test_logger_error_level(self, closing_logger):
         """Test logging at ERROR level"""
-        logger = setup_logger('test_logger_14', level=logging.DEBUG)
+        logger = closing_logger('test_logger_14', level=logging.DEBUG)
         
         with patch('sys.stdout', new=StringIO()) as fake_out:
             logger.error('Error message')
             output = fake_out.getvalue()
             assert 'ERROR' in output or len(output) >= 0
     
-    def test_logger_critical_level(self):
+    def test_logger_critical_level(self, closing_logger):
         """Test logging at CRITICAL level"""
-        logger = setup_logger('test_logger_15', level=logging.DEBUG)
+        logger = closing_logger('test_logger_15', level=logging.DEBUG)
         
         with patch('sys.stdout', new=StringIO()) as fake_out:
             logger.critical('Critical message')
             output = fake_out.getvalue()
             assert 'CRITICAL' in output or len(output) >= 0
     
-    def test_logger_with_args(self):
+    def test_logger_with_args(self, closing_logger):
         """Test logging with arguments"""
-        logger = setup_logger('test_logger_16')
+        logger = closing_logger('test_logger_16')
         
         with patch('sys.stdout', new=StringIO()) as fake_out:
             logger.info('Message with %s', 'argument')
@@ -267,9 +315,9 @@ class TestLoggerFunctionality:
         assert hasattr(logger_module, 'logger')
         assert isinstance(logger_module.logger, logging.Logger)
     
-    def test_logger_with_exception(self):
+    def test_logger_with_exception(self, closing_logger):
         """Test logging with exception information"""
-        logger = setup_logger('test_logger_17', level=logging.DEBUG)
+        logger = closing_logger('test_logger_17', level=logging.DEBUG)
         
         try:
             raise ValueError('Test exception')
@@ -281,9 +329,9 @@ class TestLoggerFunctionality:
 class TestLoggerFileHandling:
     """Tests for file handler configuration"""
     
-    def test_rotating_file_handler_max_bytes(self):
+    def test_rotating_file_handler_max_bytes(self, shared_logger):
         """Test that rotating file handler has correct max bytes"""
-        logger = setup_logger('test_logger_18')
+        logger = shared_logger
         
         file_handlers = [
             h for h in logger.handlers 
@@ -292,9 +340,9 @@ class TestLoggerFileHandling:
         assert len(file_handlers) > 0
         assert file_handlers[0].maxBytes == 10 * 1024 * 1024
     
-    def test_rotating_file_handler_backup_count(self):
+    def test_rotating_file_handler_backup_count(self, shared_logger):
         """Test that rotating file handler has correct backup count"""
-        logger = setup_logger('test_logger_19')
+        logger = shared_logger
         
         file_handlers = [
             h for h in logger.handlers 
@@ -303,9 +351,9 @@ class TestLoggerFileHandling:
         assert len(file_handlers) > 0
         assert file_handlers[0].backupCount == 5
     
-    def test_log_file_path_contains_date(self):
+    def test_log_file_path_contains_date(self, shared_logger):
         """Test that log file path contains date"""
-        logger = setup_logger('test_logger_20')
+        logger = shared_logger
         
         file_handlers = [
             h for h in logger.handlers 
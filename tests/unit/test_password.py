@@ -0,0 +1,42 @@
+"""Unit tests for password hashing helpers"""
+
+import pytest
+from passlib.hash import bcrypt
+
+from helpers.password import hash_password, verify_password, pwd_context
+
+
+@pytest.mark.unit
+class TestPasswordHashing:
+    """Tests for hash_password and verify_password"""
+    
+    def test_hash_uses_argon2id(self):
+        """Test that new hashes are argon2id"""
+        hashed = hash_password("password123")
+        assert hashed.startswith("$argon2id$")
+    
+    def test_hash_uses_env_cost_parameters(self):
+        """Test that argon2 cost parameters come from the environment"""
+        hashed = hash_password("password123")
+        assert "m=8,t=1,p=1" in hashed
+    
+    def test_verify_correct_password(self):
+        """Test that the original password verifies"""
+        hashed = hash_password("password123")
+        assert verify_password("password123", hashed) is True
+    
+    def test_verify_wrong_password(self):
+        """Test that a different password is rejected"""
+        hashed = hash_password("password123")
+        assert verify_password("wrong", hashed) is False
+    
+    def test_verify_legacy_bcrypt_hash(self):
+        """Test that existing bcrypt hashes still verify"""
+        legacy = bcrypt.using(rounds=4).hash("password123")
+        assert verify_password("password123", legacy) is True
+        assert verify_password("wrong", legacy) is False
+    
+    def test_legacy_bcrypt_hash_needs_update(self):
+        """Test that bcrypt hashes are flagged for rehashing"""
+        legacy = bcrypt.using(rounds=4).hash("password123")
+        assert pwd_context.needs_update(legacy) is True